@@ -13,7 +13,7 @@ ROOT_AGENT_INSTR = """
                
 Current user:
   <user_profile>
-  {user_profile}
+  {user:user_profile}
   </user_profile>
 
 Current time: {_time}
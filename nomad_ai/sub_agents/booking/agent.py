@@ -21,6 +21,7 @@ from google.genai.types import GenerateContentConfig
 
 from nomad_ai.shared_libraries import types
 from nomad_ai.sub_agents.booking import prompt
+from nomad_ai.tools.state_delta import state_write_filter
 
 from toolbox_core import ToolboxSyncClient
 
@@ -87,5 +88,7 @@ booking_agent = Agent(
     ],
     generate_content_config=GenerateContentConfig(
         temperature=0.0, top_p=0.5
-    )
+    ),
+    before_tool_callback=state_write_filter.before_tool,
+    after_tool_callback=state_write_filter.after_tool,
 )
\ No newline at end of file
@@ -20,12 +20,11 @@ from google.adk.tools.agent_tool import AgentTool
 from nomad_ai.sub_agents.in_trip import prompt
 from nomad_ai.sub_agents.in_trip.tools import (
     transit_coordination,
-    flight_status_check,
-    event_booking_check,
-    weather_impact_check,
+    monitor_trip,
 )
 
 from nomad_ai.tools.memory import memorize
+from nomad_ai.tools.state_delta import state_write_filter
 
 
 # This sub-agent is expected to be called every day closer to the trip, and frequently several times a day during the trip.
@@ -42,7 +41,7 @@ trip_monitor_agent = Agent(
     name="trip_monitor_agent",
     description="Monitor aspects of a itinerary and bring attention to items that necessitate changes",
     instruction=prompt.TRIP_MONITOR_INSTR,
-    tools=[flight_status_check, event_booking_check, weather_impact_check],
+    tools=[monitor_trip],
     output_key="daily_checks",  # can be sent via email.
 )
 
@@ -59,4 +58,6 @@ in_trip_agent = Agent(
         AgentTool(agent=day_of_agent), 
         memorize
     ],
+    before_tool_callback=state_write_filter.before_tool,
+    after_tool_callback=state_write_filter.after_tool,
 )
@@ -0,0 +1,184 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The checks the trip monitor runs on an itinerary, and the findings it reports."""
+
+from datetime import datetime, timedelta
+import os
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+from nomad_ai.sub_agents.in_trip.timeline import event_datetime
+
+# Hours before an event that its check becomes useful, by check type.
+FLIGHT_CHECK_LEAD_HOURS = float(os.getenv("FLIGHT_CHECK_LEAD_HOURS", 48))
+BOOKING_CHECK_LEAD_HOURS = float(os.getenv("BOOKING_CHECK_LEAD_HOURS", 72))
+# Forecasts further out than this are not worth checking.
+WEATHER_CHECK_LEAD_HOURS = float(os.getenv("WEATHER_CHECK_LEAD_HOURS", 120))
+
+FLIGHT = "flight"
+BOOKING = "booking"
+WEATHER = "weather"
+
+# Words telling an outdoor visit apart, for events without an "outdoor" field;
+# INDOOR_WORDS win over OUTDOOR_WORDS.
+OUTDOOR_WORDS = {
+    "beach", "bike", "boat", "cruise", "falls", "ferry", "garden", "gardens", "harbor",
+    "hike", "hiking", "island", "kayak", "lake", "mountain", "outdoor", "park", "pier",
+    "picnic", "ruins", "stadium", "tour", "trail", "viewpoint", "walk", "walking",
+    "waterfront", "zoo",
+}
+INDOOR_WORDS = {
+    "aquarium", "breakfast", "cinema", "dinner", "gallery", "indoor", "lunch", "mall",
+    "museum", "restaurant", "show", "spa", "theater", "theatre",
+}
+
+
+class CheckItem(NamedTuple):
+    """A check of one itinerary event, and when it is worth running."""
+
+    kind: str
+    date: str
+    name: str
+    args: Dict[str, str]
+    opens: datetime
+    closes: datetime
+
+
+def _place(event: Dict[str, Any]) -> Tuple[str, str]:
+    """The (name, address) of an event, from its location or its own fields."""
+    location = event.get("location") or {}
+    name = location.get("name") or event.get("description", "")
+    return name, location.get("address") or event.get("address", "")
+
+
+def is_outdoor(event: Dict[str, Any]) -> bool:
+    """
+    Whether a visit may be impacted by weather.
+
+    An "outdoor" field on the event decides; otherwise the words of its
+    description and location name do.
+    """
+    if "outdoor" in event:
+        return bool(event["outdoor"])
+    words = set(re.findall(r"[a-z]+", f"{event.get('description', '')} {_place(event)[0]}".lower()))
+    return bool(words & OUTDOOR_WORDS) and not words & INDOOR_WORDS
+
+
+def _window(due: datetime, lead_hours: float) -> Tuple[datetime, datetime]:
+    if due == datetime.max:
+        return due, due
+    return due - timedelta(hours=lead_hours), due
+
+
+def extract_checks(itinerary: Dict[str, Any]) -> List[CheckItem]:
+    """
+    Lists the checks an itinerary calls for, in itinerary order.
+
+    Flights get a flight status check. Hotels and other events that require
+    booking get a booking check. Outdoor visits get a weather check, on top of
+    their booking check if they have one.
+
+    Args:
+        itinerary: A dictionary following the types.Itinerary schema.
+
+    Returns:
+        The checks, with the arguments of their check function and their window.
+    """
+    items = []
+    for day in itinerary.get("days", []):
+        date = day["date"]
+        for event in day["events"]:
+            event_type = event.get("event_type")
+            due = event_datetime(date, event)
+            if event_type == FLIGHT:
+                items.append(
+                    CheckItem(
+                        FLIGHT,
+                        date,
+                        event.get("flight_number", ""),
+                        {
+                            "flight_number": event.get("flight_number", ""),
+                            "flight_date": date,
+                            "checkin_time": event.get("boarding_time", ""),
+                            "departure_time": event.get("departure_time", ""),
+                        },
+                        *_window(due, FLIGHT_CHECK_LEAD_HOURS),
+                    )
+                )
+                continue
+            name, address = _place(event)
+            if event.get("booking_required", event_type == "hotel"):
+                items.append(
+                    CheckItem(
+                        BOOKING,
+                        date,
+                        name,
+                        {"event_name": name, "event_date": date, "event_location": address},
+                        *_window(due, BOOKING_CHECK_LEAD_HOURS),
+                    )
+                )
+            if event_type == "visit" and is_outdoor(event):
+                items.append(
+                    CheckItem(
+                        WEATHER,
+                        date,
+                        name,
+                        {"activity_name": name, "activity_date": date, "activity_location": address},
+                        *_window(due, WEATHER_CHECK_LEAD_HOURS),
+                    )
+                )
+    return items
+
+
+def due_checks(
+    items: Iterable[CheckItem], now: datetime
+) -> Tuple[List[CheckItem], List[CheckItem]]:
+    """
+    Splits checks into those due now and those whose window is still ahead.
+
+    Args:
+        items: The checks, e.g. from extract_checks.
+        now: The current date and time.
+
+    Returns:
+        The (due, upcoming) checks; checks of past events are left out.
+    """
+    due, upcoming = [], []
+    for item in items:
+        if item.closes < now:
+            continue
+        (due if item.opens <= now else upcoming).append(item)
+    return due, upcoming
+
+
+def findings_table(items: List[CheckItem], results: List[Dict[str, Any]]) -> str:
+    """
+    Formats check results as a compact table, one line per check.
+
+    Args:
+        items: The checks run.
+        results: Their results, in the same order.
+
+    Returns:
+        Lines of "date | check | item | status".
+    """
+    lines = ["date | check | item | status"]
+    for item, result in zip(items, results):
+        if "error" in result:
+            status = f"not checked: {result['error']}"
+        else:
+            status = result.get("status", "")
+        lines.append(f"{item.date} | {item.kind} | {item.name} | {status}")
+    return "\n".join(lines)
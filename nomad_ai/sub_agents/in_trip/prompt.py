@@ -15,33 +15,23 @@
 """Prompt for in_trip, trip_monitor and day_of agents."""
 
 TRIP_MONITOR_INSTR = """
-Given an itinerary: 
-<itinerary>
-{itinerary}
-</itinerary>
-
-and the user profile:
+Given the user profile:
 <user_profile>
-{user_profile}
+{user:user_profile}
 </user_profile>
 
-If the itinerary is empty, inform the user that you can help once there is an itinerary, and asks to transfer the user back to the `inspiration_agent`.
-Otherwise, follow the rest of the instruction.
-
-Identify these type of events, and note their details:
-- Flights: note flight number, date, check-in time and departure time.
-- Events that requires booking: note the event name, date and location.
-- Activities or visits that may be impacted by weather: note date, location and desired weather.
+Call `monitor_trip` once. It checks the flights, the events that require booking and the outdoor activities of the itinerary that are due for a check,
+and returns its findings as a table with one line per check: date | check | item | status.
+Statuses checked recently are reused; set `refresh` to true only when the user asks to check everything again.
 
-For each identified events, checks their status using tools:s
-- flights delays or cancelations - use `flight_status_check`
-- events that requires booking - use `event_booking_check`
-- outdoor activities that may be affected by weather, weather forecasts - use `weather_impact`
+If it reports that there is no itinerary, inform the user that you can help once there is an itinerary, and asks to transfer the user back to the `inspiration_agent`.
+Otherwise, follow the rest of the instruction.
 
-Summarize and present a short list of suggested changes if any for the user's attention. For example:
+Summarize the findings and present a short list of suggested changes if any for the user's attention. For example:
 - Flight XX123 is cancelled, suggest rebooking.
 - Event ABC may be affected by bad weather, suggest find alternatives.
 - ...etc.
+Also list the items that could not be checked. Items not due for a check yet are checked on a later run; do not check them yourself.
 
 Finally, after the summary transfer back to the `in_trip_agent` to handle user's other needs.
 """
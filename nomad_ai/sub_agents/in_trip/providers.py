@@ -0,0 +1,288 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Providers answering the flight, booking and weather checks.
+
+A provider is any object with an async check method taking the arguments of
+its check function as keywords and returning a dictionary with a "status":
+
+    class MyWeatherProvider:
+        async def check(self, activity_name, activity_date, activity_location):
+            ...
+            return {"status": "Rain expected in the afternoon."}
+
+Select one with FLIGHT_STATUS_PROVIDER, BOOKING_STATUS_PROVIDER or
+WEATHER_PROVIDER set to "package.module:ClassName"; without one, the check
+is answered by a local fake. Each provider is wrapped in a ResilientProvider,
+which bounds its calls with a deadline, hedges the slow ones and stops
+calling it for a while once it keeps failing.
+"""
+
+import abc
+import asyncio
+import importlib
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from nomad_ai.sub_agents.in_trip.monitor import BOOKING, FLIGHT, WEATHER
+
+FLIGHT_STATUS_PROVIDER = os.getenv("FLIGHT_STATUS_PROVIDER", "")
+BOOKING_STATUS_PROVIDER = os.getenv("BOOKING_STATUS_PROVIDER", "")
+WEATHER_PROVIDER = os.getenv("WEATHER_PROVIDER", "")
+
+# Seconds a provider call may take, hedge included.
+PROVIDER_DEADLINE = float(os.getenv("PROVIDER_DEADLINE", 5.0))
+# Seconds after which a second, hedged call is sent if the first has not answered; 0 disables hedging.
+PROVIDER_HEDGE_AFTER = float(os.getenv("PROVIDER_HEDGE_AFTER", 1.0))
+# Consecutive failures opening a provider's circuit, and seconds before it is tried again.
+PROVIDER_BREAKER_FAILURES = int(os.getenv("PROVIDER_BREAKER_FAILURES", 5))
+PROVIDER_BREAKER_RESET = float(os.getenv("PROVIDER_BREAKER_RESET", 30.0))
+
+# Seconds the fake providers take to answer.
+FAKE_PROVIDER_LATENCY = float(os.getenv("FAKE_PROVIDER_LATENCY", 0.0))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class FakeProvider(abc.ABC):
+    """
+    A local provider answering after a configurable delay, for tests and demos.
+
+    Args:
+        latency: Seconds added to every answer.
+        jitter: Extra uniformly random seconds added to every answer.
+        error_rate: Fraction of calls failing with a ConnectionError.
+    """
+
+    def __init__(
+        self, latency: float = FAKE_PROVIDER_LATENCY, jitter: float = 0.0, error_rate: float = 0.0
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.calls = 0
+
+    async def check(self, **args: str) -> Dict[str, Any]:
+        self.calls += 1
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if random.random() < self.error_rate:
+            raise ConnectionError(f"{type(self).__name__} is unavailable.")
+        return self.status(**args)
+
+    @abc.abstractmethod
+    def status(self, **args: str) -> Dict[str, Any]:
+        """Returns the answer to a check."""
+
+
+class FakeFlightStatusProvider(FakeProvider):
+    def status(self, flight_number: str, flight_date: str, checkin_time: str, departure_time: str):
+        return {"status": f"Flight {flight_number} checked"}
+
+
+class FakeBookingProvider(FakeProvider):
+    def status(self, event_name: str, event_date: str, event_location: str):
+        if event_name.startswith("Space Needle"):  # Mocking an exception to illustrate
+            return {"status": f"{event_name} is closed."}
+        return {"status": f"{event_name} checked"}
+
+
+class FakeWeatherProvider(FakeProvider):
+    def status(self, activity_name: str, activity_date: str, activity_location: str):
+        return {"status": f"{activity_name} checked"}
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a provider after failure_threshold consecutive failures.
+
+    Once open, the circuit lets a single trial call through every
+    reset_timeout seconds. The circuit closes again on the first success.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = PROVIDER_BREAKER_FAILURES,
+        reset_timeout: float = PROVIDER_BREAKER_RESET,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go through now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout or self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+    def release(self):
+        """Ends a call that neither succeeded nor failed, e.g. a cancelled one."""
+        with self._lock:
+            self._trial = False
+
+
+class ResilientProvider:
+    """
+    Calls a provider with a deadline, hedging and a circuit breaker.
+
+    If the provider has not answered after hedge_after seconds, a second call
+    is sent and the first answer of the two wins; the other call is
+    cancelled. A call, hedge included, fails with a TimeoutError past the
+    deadline. Failures and timeouts count towards the circuit breaker, and
+    calls while the circuit is open fail right away with a CircuitOpenError.
+
+    Args:
+        provider: The provider to call.
+        deadline: Seconds a call may take.
+        hedge_after: Seconds before the hedged call; 0 disables hedging.
+        breaker: The circuit breaker of the provider.
+    """
+
+    def __init__(
+        self,
+        provider,
+        deadline: float = PROVIDER_DEADLINE,
+        hedge_after: float = PROVIDER_HEDGE_AFTER,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.provider = provider
+        self.deadline = deadline
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker()
+
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.rejected = 0
+
+    async def _hedged(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        first = asyncio.ensure_future(self.provider.check(**args))
+        pending = {first}
+        try:
+            if 0 < self.hedge_after < self.deadline:
+                done, _ = await asyncio.wait(pending, timeout=self.hedge_after)
+                if not done:
+                    self.hedged += 1
+                    pending.add(asyncio.ensure_future(self.provider.check(**args)))
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def check(self, **args: str) -> Dict[str, Any]:
+        """
+        Calls the provider.
+
+        Args:
+            **args: The arguments of the check function.
+
+        Returns:
+            What the provider returned.
+        """
+        if not self.breaker.allow():
+            self.rejected += 1
+            raise CircuitOpenError(f"{type(self.provider).__name__} is unavailable, try again later.")
+        self.calls += 1
+        try:
+            result = await asyncio.wait_for(self._hedged(args), self.deadline)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.breaker.record_failure()
+            raise
+        except Exception:
+            self.failures += 1
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled: the call tells nothing about the provider, but a
+            # half-open circuit must let the next trial through.
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns call, hedge and failure counters, and the circuit state."""
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "circuit": self.breaker.state,
+        }
+
+
+def _load_provider(spec: str, fake: FakeProvider):
+    if not spec:
+        return fake
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def load_default_providers() -> Dict[str, ResilientProvider]:
+    """Returns the provider of each check type, as configured by the *_PROVIDER variables."""
+    return {
+        FLIGHT: ResilientProvider(_load_provider(FLIGHT_STATUS_PROVIDER, FakeFlightStatusProvider())),
+        BOOKING: ResilientProvider(_load_provider(BOOKING_STATUS_PROVIDER, FakeBookingProvider())),
+        WEATHER: ResilientProvider(_load_provider(WEATHER_PROVIDER, FakeWeatherProvider())),
+    }
@@ -0,0 +1,204 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache of the statuses returned by the flight, booking and weather checks."""
+
+from collections import OrderedDict
+from datetime import datetime, time as day_time
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from nomad_ai.sub_agents.in_trip.monitor import BOOKING, FLIGHT, WEATHER
+
+# Seconds a status stays fresh while its event is still far off, by check type.
+FLIGHT_STATUS_TTL = float(os.getenv("FLIGHT_STATUS_TTL", 6 * 3600))
+BOOKING_STATUS_TTL = float(os.getenv("BOOKING_STATUS_TTL", 12 * 3600))
+WEATHER_STATUS_TTL = float(os.getenv("WEATHER_STATUS_TTL", 3 * 3600))
+# A status stays fresh for at most this fraction of the time left before its
+# event, so that statuses are refreshed more often as departure approaches.
+STATUS_TTL_FRACTION = float(os.getenv("STATUS_TTL_FRACTION", 0.1))
+STATUS_MIN_TTL = float(os.getenv("STATUS_MIN_TTL", 60))
+STATUS_CACHE_MAX_ENTRIES = int(os.getenv("STATUS_CACHE_MAX_ENTRIES", 10000))
+
+# The check arguments a status depends on, by check type.
+KEY_FIELDS = {
+    FLIGHT: ("flight_number", "flight_date"),
+    BOOKING: ("event_name", "event_date"),
+    WEATHER: ("activity_name", "activity_location", "activity_date"),
+}
+# The check arguments holding the date, and the time if any, of the event.
+DUE_FIELDS = {
+    FLIGHT: ("flight_date", "departure_time"),
+    BOOKING: ("event_date", None),
+    WEATHER: ("activity_date", None),
+}
+
+
+def due_datetime(kind: str, args: Dict[str, Any]) -> Optional[datetime]:
+    """When the event of a check is due: its time if the check has one, else the start of its day."""
+    date_field, time_field = DUE_FIELDS[kind]
+    try:
+        day = datetime.strptime(args.get(date_field, ""), "%Y-%m-%d")
+    except ValueError:
+        return None
+    try:
+        return datetime.combine(day.date(), day_time.fromisoformat(args.get(time_field) or ""))
+    except ValueError:
+        return day
+
+
+class _Counters:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+
+class StatusCache:
+    """
+    Check statuses by what they depend on, e.g. a flight's number and date.
+
+    A status is fresh for its check type's TTL, but never longer than
+    ttl_fraction of the time left before the event, nor shorter than min_ttl.
+    The time left is measured from the trip's current time, which the
+    in-trip agent may set apart from the clock.
+
+    Args:
+        ttls: Seconds a status stays fresh, by check type.
+        ttl_fraction: Fraction of the time left before the event a status stays fresh.
+        min_ttl: Seconds a status stays fresh at least.
+        max_entries: Statuses kept; the least recently used go first.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        ttl_fraction: float = STATUS_TTL_FRACTION,
+        min_ttl: float = STATUS_MIN_TTL,
+        max_entries: int = STATUS_CACHE_MAX_ENTRIES,
+    ):
+        self.ttls = ttls or {
+            FLIGHT: FLIGHT_STATUS_TTL,
+            BOOKING: BOOKING_STATUS_TTL,
+            WEATHER: WEATHER_STATUS_TTL,
+        }
+        self.ttl_fraction = ttl_fraction
+        self.min_ttl = min_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # (kind, key) -> (status, monotonic expiry time)
+        self._entries: OrderedDict[Tuple[str, Tuple], Tuple[Dict[str, Any], float]] = OrderedDict()
+        self._counters = {kind: _Counters() for kind in KEY_FIELDS}
+        self.invalidated = 0
+
+    @staticmethod
+    def key(kind: str, args: Dict[str, Any]) -> Tuple:
+        return tuple(str(args.get(field, "")).strip().lower() for field in KEY_FIELDS[kind])
+
+    def ttl(self, kind: str, args: Dict[str, Any], now: Optional[datetime] = None) -> float:
+        """
+        Returns how long a new status of a check stays fresh.
+
+        Args:
+            kind: The check type.
+            args: The check arguments.
+            now: The trip's current time; defaults to the clock.
+        """
+        ttl = self.ttls[kind]
+        due = due_datetime(kind, args)
+        if due is not None:
+            left = (due - (now or datetime.now())).total_seconds()
+            ttl = min(ttl, self.ttl_fraction * left)
+        return max(ttl, self.min_ttl)
+
+    def get(self, kind: str, args: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Returns the fresh status of a check, if cached.
+
+        Args:
+            kind: The check type, e.g. FLIGHT.
+            args: The check arguments.
+        """
+        entry_key = (kind, self.key(kind, args))
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(entry_key)
+                self._counters[kind].hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[entry_key]
+            self._counters[kind].misses += 1
+            return None
+
+    def put(
+        self,
+        kind: str,
+        args: Dict[str, Any],
+        status: Dict[str, Any],
+        now: Optional[datetime] = None,
+    ):
+        """
+        Caches the status of a check.
+
+        Args:
+            kind: The check type.
+            args: The check arguments.
+            status: What the check returned.
+            now: The trip's current time; defaults to the clock.
+        """
+        expires_at = time.monotonic() + self.ttl(kind, args, now)
+        entry_key = (kind, self.key(kind, args))
+        with self._lock:
+            self._entries[entry_key] = (status, expires_at)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, kind: Optional[str] = None, args: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Drops cached statuses, so that their checks run again.
+
+        Args:
+            kind: The check type to drop; all types if None.
+            args: The check arguments to drop the status of; all of the type's if None.
+
+        Returns:
+            The number of statuses dropped.
+        """
+        with self._lock:
+            if args is not None:
+                dropped = [(kind, self.key(kind, args))]
+            else:
+                dropped = [entry_key for entry_key in self._entries if kind in (None, entry_key[0])]
+            count = sum(self._entries.pop(entry_key, None) is not None for entry_key in dropped)
+            self.invalidated += count
+            return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the hit rate of each check type."""
+        with self._lock:
+            stats = {"entries": len(self._entries), "invalidated": self.invalidated}
+            for kind, counters in self._counters.items():
+                lookups = counters.hits + counters.misses
+                stats[kind] = {
+                    "hits": counters.hits,
+                    "misses": counters.misses,
+                    "hit_rate": counters.hits / lookups if lookups else 0.0,
+                }
+            return stats
+
+
+status_cache = StatusCache()
@@ -0,0 +1,160 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A sorted index of the events of an itinerary, for finding the next event by bisection."""
+
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, time
+import hashlib
+import os
+import pickle
+import threading
+from typing import Any, Dict, List, Tuple
+
+TIMELINE_CACHE_SIZE = int(os.getenv("TIMELINE_CACHE_SIZE", 256))
+
+# The field holding the time to be at an event, by event type.
+EVENT_TIME_FIELDS = {
+    "flight": "boarding_time",
+    "hotel": "check_in_time",
+    "visit": "start_time",
+}
+
+
+def event_datetime(date: str, event: Dict[str, Any]) -> datetime:
+    """
+    Returns when an event is due.
+
+    Events without a usable time are due at the end of their day, so they stay
+    ahead of the traveler for the whole day, as they did when untimed events
+    were matched on their date alone.
+    """
+    try:
+        day = datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        return datetime.max
+    event_time = event.get(EVENT_TIME_FIELDS.get(event.get("event_type"), ""))
+    if event_time:
+        try:
+            return datetime.combine(day.date(), time.fromisoformat(event_time))
+        except ValueError:
+            pass
+    return datetime.combine(day.date(), time.max)
+
+
+class Timeline:
+    """
+    The events of an itinerary in itinerary order, indexed by due time.
+
+    due_by[i] is the latest due time among the first i + 1 events. It never
+    decreases, so the first event due at or after a given time is found by
+    bisecting it, even if the itinerary lists some events out of order.
+
+    Args:
+        itinerary: A dictionary following the types.Itinerary schema.
+    """
+
+    def __init__(self, itinerary: Dict[str, Any]):
+        self.events: List[Dict[str, Any]] = []
+        self.due_by: List[datetime] = []
+        latest = datetime.min
+        for day in itinerary.get("days", []):
+            for event in day["events"]:
+                latest = max(latest, event_datetime(day["date"], event))
+                self.events.append(event)
+                self.due_by.append(latest)
+
+    def segment(
+        self, home: Dict[str, Any], current: datetime
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Returns the (origin, destination) events of the trip leg due next.
+
+        Args:
+            home: The traveler's home, the origin of the first event.
+            current: The current date and time.
+
+        Returns:
+            The event before the next one due, or home, and the next event due.
+            Past the last event, the last two events; home, without events.
+        """
+        i = bisect_left(self.due_by, current)
+        if i == len(self.events):
+            i -= 1
+        if i < 0:
+            return home, home
+        return (self.events[i - 1] if i > 0 else home), self.events[i]
+
+
+_lock = threading.Lock()
+_timelines: OrderedDict[bytes, Timeline] = OrderedDict()
+# id of an itinerary -> (the itinerary, its fingerprint), so that looking up
+# the same object again does not pickle it again.
+_fingerprints: OrderedDict[int, Tuple[Any, bytes]] = OrderedDict()
+
+
+def fingerprint(value: Any) -> bytes:
+    """A digest of a state value, for use as a cache key."""
+    # pickle encodes plain dicts and lists several times faster than canonical
+    # JSON. Equal contents may still pickle differently, e.g. in another key
+    # order, which only costs an extra cache entry.
+    return hashlib.sha1(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)).digest()
+
+
+def _itinerary_fingerprint(itinerary: Dict[str, Any]) -> bytes:
+    with _lock:
+        known = _fingerprints.get(id(itinerary))
+    if known is not None and known[0] is itinerary:
+        return known[1]
+    digest = fingerprint(itinerary)
+    with _lock:
+        _fingerprints[id(itinerary)] = (itinerary, digest)
+        _fingerprints.move_to_end(id(itinerary))
+        while len(_fingerprints) > TIMELINE_CACHE_SIZE:
+            _fingerprints.popitem(last=False)
+    return digest
+
+
+def forget_fingerprints():
+    """Forgets the fingerprints of the itineraries looked up, e.g. once one was edited in place."""
+    with _lock:
+        _fingerprints.clear()
+
+
+def get_timeline(itinerary: Dict[str, Any]) -> Timeline:
+    """
+    Returns the timeline of an itinerary, built once per itinerary content.
+
+    The fingerprint of an itinerary object is reused while the object is
+    looked up again; call forget_fingerprints after editing one in place.
+
+    Args:
+        itinerary: A dictionary following the types.Itinerary schema.
+
+    Returns:
+        The cached or newly built timeline.
+    """
+    digest = _itinerary_fingerprint(itinerary)
+    with _lock:
+        timeline = _timelines.get(digest)
+        if timeline is not None:
+            _timelines.move_to_end(digest)
+    if timeline is None:
+        timeline = Timeline(itinerary)
+        with _lock:
+            _timelines[digest] = timeline
+            while len(_timelines) > TIMELINE_CACHE_SIZE:
+                _timelines.popitem(last=False)
+    return timeline
@@ -14,30 +14,77 @@
 
 """Tools for the in_trip, trip_monitor and day_of agents."""
 
+import asyncio
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools import ToolContext
 
 from nomad_ai.sub_agents.in_trip import prompt
 from nomad_ai.shared_libraries import constants
-
-
-def flight_status_check(flight_number: str, flight_date: str, checkin_time: str, departure_time: str):
+from nomad_ai.shared_libraries.tracing import get_tracer
+from nomad_ai.sub_agents.in_trip.monitor import (
+    BOOKING,
+    FLIGHT,
+    WEATHER,
+    due_checks,
+    extract_checks,
+    findings_table,
+)
+from nomad_ai.sub_agents.in_trip.providers import load_default_providers
+from nomad_ai.sub_agents.in_trip.status_cache import status_cache
+from nomad_ai.sub_agents.in_trip.timeline import fingerprint, forget_fingerprints, get_timeline
+from nomad_ai.tools.memory import get_user_profile
+from nomad_ai.tools.state_delta import state_write_filter
+
+tracer = get_tracer(__name__)
+
+# The provider answering each check type.
+providers = load_default_providers()
+
+# Seconds a single check in a batch may take before it is reported as timed out.
+CHECK_TIMEOUT = float(os.getenv("CHECK_TIMEOUT", 10.0))
+# Checks of a batch running at the same time.
+CHECK_CONCURRENCY = int(os.getenv("CHECK_CONCURRENCY", 8))
+
+INSTRUCTION_CACHE_SIZE = int(os.getenv("INSTRUCTION_CACHE_SIZE", 256))
+
+
+async def flight_status_check(flight_number: str, flight_date: str, checkin_time: str, departure_time: str):
     """Checks the status of a flight, given its flight_number, date, checkin_time and departure_time."""
-    print("Checking", flight_number, flight_date, checkin_time, departure_time)
-    return {"status": f"Flight {flight_number} checked"}
+    tracer.info(
+        "flight_status_check",
+        flight_number=flight_number,
+        flight_date=flight_date,
+        checkin_time=checkin_time,
+        departure_time=departure_time,
+    )
+    return await providers[FLIGHT].check(
+        flight_number=flight_number,
+        flight_date=flight_date,
+        checkin_time=checkin_time,
+        departure_time=departure_time,
+    )
 
 
-def event_booking_check(event_name: str, event_date: str, event_location: str):
+async def event_booking_check(event_name: str, event_date: str, event_location: str):
     """Checks the status of an event that requires booking, given its event_name, date, and event_location."""
-    print("Checking", event_name, event_date, event_location)
-    if event_name.startswith("Space Needle"):  # Mocking an exception to illustrate
-        return {"status": f"{event_name} is closed."}
-    return {"status": f"{event_name} checked"}
+    tracer.info(
+        "event_booking_check",
+        event_name=event_name,
+        event_date=event_date,
+        event_location=event_location,
+    )
+    return await providers[BOOKING].check(
+        event_name=event_name, event_date=event_date, event_location=event_location
+    )
 
 
-def weather_impact_check(activity_name: str, activity_date: str, activity_location: str):
+async def weather_impact_check(activity_name: str, activity_date: str, activity_location: str):
     """
     Checks the status of an outdoor activity that may be impacted by weather, given its name, date, and its location.
 
@@ -49,21 +96,75 @@ def weather_impact_check(activity_name: str, activity_date: str, activity_locati
     Returns:
         A dictionary containing the status of the activity.
     """
-    print("Checking", activity_name, activity_date, activity_location)
-    return {"status": f"{activity_name} checked"}
+    tracer.info(
+        "weather_impact_check",
+        activity_name=activity_name,
+        activity_date=activity_date,
+        activity_location=activity_location,
+    )
+    return await providers[WEATHER].check(
+        activity_name=activity_name,
+        activity_date=activity_date,
+        activity_location=activity_location,
+    )
 
 
-def get_event_time_as_destination(destin_json: Dict[str, Any], default_value: str):
-    """Returns an event time appropriate for the location type."""
-    match destin_json["event_type"]:
-        case "flight":
-            return destin_json["boarding_time"]
-        case "hotel":
-            return destin_json["check_in_time"]
-        case "visit":
-            return destin_json["start_time"]
-        case _:
-            return default_value
+async def run_checks(
+    check: Callable[..., Dict[str, Any]],
+    items: List[Dict[str, Any]],
+    timeout: float = CHECK_TIMEOUT,
+    concurrency: int = CHECK_CONCURRENCY,
+    kind: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Runs a check on several items concurrently.
+
+    A check that does not answer within the timeout, or fails, is reported on
+    its item rather than failing the batch. A timed out async check is
+    cancelled; a plain function, run in a thread, is abandoned.
+
+    Args:
+        check: A check function, called with each item as keyword arguments.
+        items: The arguments of each check.
+        timeout: Seconds each check may take.
+        concurrency: Checks running at the same time.
+        kind: The check type, e.g. FLIGHT, to answer from and fill the status cache.
+        now: The trip's current time, which the status freshness depends on.
+
+    Returns:
+        The items in order, each with the status returned by its check or an
+        error, and the number of checks that were cached, timed out or failed.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    counts = {"cached": 0, "timed_out": 0, "failed": 0}
+
+    async def run(item: Dict[str, Any]) -> Dict[str, Any]:
+        if kind is not None:
+            cached = status_cache.get(kind, item)
+            if cached is not None:
+                counts["cached"] += 1
+                return {**item, **cached}
+        async with semaphore:
+            try:
+                if asyncio.iscoroutinefunction(check):
+                    pending = check(**item)
+                else:
+                    pending = asyncio.to_thread(check, **item)
+                result = await asyncio.wait_for(pending, timeout)
+            except asyncio.TimeoutError:
+                counts["timed_out"] += 1
+                return {**item, "error": f"No answer within {timeout:g} seconds."}
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                counts["failed"] += 1
+                return {**item, "error": f"{type(e).__name__}: {e}"}
+        if kind is not None:
+            status_cache.put(kind, item, result, now)
+        return {**item, **result}
+
+    results = await asyncio.gather(*(run(item) for item in items))
+    tracer.info("run_checks", check=check.__name__, items=len(items), **counts)
+    return {"results": results, **counts}
 
 
 def parse_as_origin(origin_json: Dict[str, Any]):
@@ -144,40 +245,10 @@ def find_segment(profile: Dict[str, Any], itinerary: Dict[str, Any], current_dat
     """
     # Expects current_datetime is in '2024-03-15 04:00:00' format
     datetime_object = datetime.fromisoformat(current_datetime)
-    current_date = datetime_object.strftime("%Y-%m-%d")
-    current_time = datetime_object.strftime("%H:%M")
-    event_date = current_date
-    event_time = current_time
-
-    print("-----")
-    print("MATCH DATE", current_date, current_time)
-    print("-----")
-
-    # defaults
-    origin_json = profile["home"]
-    destin_json = profile["home"]
-
-    leave_by = "No movement required"
-    arrive_by = "No movement required"
-
-    # Go through the itinerary to find where we are base on the current date and time
-    for day in itinerary.get("days", []):
-        event_date = day["date"]
-        for event in day["events"]:
-            # for every event we update the origin and destination until
-            # we find one we need to pay attention
-            origin_json = destin_json
-            destin_json = event
-            event_time = get_event_time_as_destination(destin_json, current_time)
-            # The moment we find an event that's in the immediate future we stop to handle it
-            print(
-                event["event_type"], event_date, current_date, event_time, current_time
-            )
-            if event_date >= current_date and event_time >= current_time:
-                break
-        else:  # if inner loop not break, continue
-            continue
-        break  # else break too.
+    tracer.debug("find_segment", current_datetime=current_datetime)
+
+    # The next event due is where we travel to, from the event before it or from home.
+    origin_json, destin_json = get_timeline(itinerary).segment(profile["home"], datetime_object)
 
     #
     # Construct prompt descriptions for travel_from, travel_to, arrive_by
@@ -192,8 +263,7 @@ def _inspect_itinerary(state: dict[str: Any]):
     """Identifies and returns the itinerary, profile and current datetime from the session state."""
 
     itinerary = state[constants.ITIN_KEY]
-    profile = state[constants.PROF_KEY]
-    print("itinerary", itinerary)
+    profile = get_user_profile(state)
     current_datetime = itinerary["start_date"] + " 00:00"
     if state.get(constants.ITIN_DATETIME, ""):
         current_datetime = state[constants.ITIN_DATETIME]
@@ -201,29 +271,99 @@ def _inspect_itinerary(state: dict[str: Any]):
     return itinerary, profile, current_datetime
 
 
-def transit_coordination(readonly_context: ReadonlyContext):
-    """Dynamically generates an instruction for the day_of agent."""
+class InstructionCache:
+    """
+    LRU cache of the day_of instructions, keyed by the content of the
+    itinerary and profile they are built from and by the itinerary_datetime.
 
-    state = readonly_context.state
+    The day_of agent runs as an AgentTool, in a new child session on every
+    call, so instructions are looked up by content alone: equal itineraries
+    share an instruction, and an itinerary edited in place gets a new one.
 
-    # Inspecting the itinerary
-    if constants.ITIN_KEY not in state:
-        return prompt.NEED_ITIN_INSTR
+    Args:
+        max_entries: Instructions kept; the least recently used go first.
+    """
 
-    itinerary, profile, current_datetime = _inspect_itinerary(state)
+    def __init__(self, max_entries: int = INSTRUCTION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._instructions: OrderedDict[Tuple[bytes, bytes, str], str] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        itinerary: Dict[str, Any],
+        profile: Dict[str, Any],
+        current_datetime: str,
+        build: Callable[[], str],
+    ) -> str:
+        """
+        Returns the instruction for an itinerary, profile and time.
+
+        Args:
+            itinerary: The itinerary in the session state.
+            profile: The user profile in the session state.
+            current_datetime: The itinerary_datetime, quoted by the instruction as is.
+            build: Builds the instruction when it is not cached.
+
+        Returns:
+            The cached or newly built instruction.
+        """
+        key = (fingerprint(itinerary), fingerprint(profile), current_datetime)
+        with self._lock:
+            instruction = self._instructions.get(key)
+            if instruction is not None:
+                self._instructions.move_to_end(key)
+                self.hits += 1
+                return instruction
+            self.misses += 1
+        instruction = build()
+        with self._lock:
+            self._instructions[key] = instruction
+            while len(self._instructions) > self.max_entries:
+                self._instructions.popitem(last=False)
+        return instruction
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns cache counters."""
+        with self._lock:
+            return {
+                "entries": len(self._instructions),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+instruction_cache = InstructionCache()
+
+
+def _forget_timeline_fingerprints(tool_context, changes: Dict[str, Any]):
+    """StateWriteFilter listener: a tool call may have edited an itinerary in place."""
+    if constants.ITIN_KEY in changes:
+        forget_fingerprints()
+
+
+state_write_filter.add_listener(_forget_timeline_fingerprints)
+
+
+def _build_transit_instruction(
+    itinerary: Dict[str, Any], profile: Dict[str, Any], current_datetime: str
+) -> str:
     travel_from, travel_to, leave_by, arrive_by = find_segment(
         profile, itinerary, current_datetime
     )
 
-    print("-----")
-    print(itinerary["trip_name"])
-    print(current_datetime)
-    print("-----")
-    print("-----")
-    print("TRIP EVENT")
-    print("FROM", travel_from, leave_by)
-    print("TO", travel_to, arrive_by)
-    print("-----")
+    tracer.debug(
+        "trip_event",
+        trip_name=itinerary.get("trip_name"),
+        current_datetime=current_datetime,
+        travel_from=travel_from,
+        leave_by=leave_by,
+        travel_to=travel_to,
+        arrive_by=arrive_by,
+    )
 
     return prompt.LOGISTIC_INSTR_TEMPLATE.format(
         CURRENT_TIME=current_datetime,
@@ -232,3 +372,65 @@ def transit_coordination(readonly_context: ReadonlyContext):
         TRAVEL_TO=travel_to,
         ARRIVE_BY_TIME=arrive_by,
     )
+
+
+def transit_coordination(readonly_context: ReadonlyContext):
+    """Dynamically generates an instruction for the day_of agent."""
+
+    state = readonly_context.state
+
+    # Inspecting the itinerary
+    if constants.ITIN_KEY not in state:
+        return prompt.NEED_ITIN_INSTR
+
+    itinerary, profile, current_datetime = _inspect_itinerary(state)
+    return instruction_cache.get(
+        itinerary,
+        profile,
+        current_datetime,
+        lambda: _build_transit_instruction(itinerary, profile, current_datetime),
+    )
+
+
+async def monitor_trip(tool_context: ToolContext, refresh: bool = False):
+    """
+    Checks the flights, bookings and outdoor activities of the itinerary that are due for a check.
+
+    Args:
+        refresh: Whether to check again the statuses checked recently, rather than reuse them.
+
+    Returns:
+        A table of findings, one line per check, and the number of checks not due yet.
+    """
+    state = tool_context.state
+    if not state.get(constants.ITIN_KEY, {}).get("days"):
+        return {"status": "There is no itinerary to monitor."}
+
+    itinerary, _, current_datetime = _inspect_itinerary(state)
+    now = datetime.fromisoformat(current_datetime)
+    due, upcoming = due_checks(extract_checks(itinerary), now)
+    if refresh:
+        for item in due:
+            status_cache.invalidate(item.kind, item.args)
+    checks = {
+        FLIGHT: flight_status_check,
+        BOOKING: event_booking_check,
+        WEATHER: weather_impact_check,
+    }
+    batches = await asyncio.gather(
+        *(
+            run_checks(check, [item.args for item in due if item.kind == kind], kind=kind, now=now)
+            for kind, check in checks.items()
+        )
+    )
+    # Put the results of each kind of check back in itinerary order.
+    pending = {kind: iter(batch["results"]) for kind, batch in zip(checks, batches)}
+    results = [next(pending[item.kind]) for item in due]
+    return {
+        "findings": findings_table(due, results),
+        "checked": len(due),
+        "not_due_yet": len(upcoming),
+        "cached": sum(batch["cached"] for batch in batches),
+        "timed_out": sum(batch["timed_out"] for batch in batches),
+        "failed": sum(batch["failed"] for batch in batches),
+    }
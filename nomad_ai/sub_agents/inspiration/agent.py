@@ -19,6 +19,7 @@ from google.adk.tools.agent_tool import AgentTool
 from nomad_ai.shared_libraries.types import DestinationIdeas, POISuggestions, json_response_config
 from nomad_ai.sub_agents.inspiration import prompt
 from nomad_ai.tools.places import map_tool
+from nomad_ai.tools.state_delta import state_write_filter
 
 
 place_agent = Agent(
@@ -51,4 +52,6 @@ inspiration_agent = Agent(
     description="A travel inspiration agent who inspire users, and discover their next vacations; Provide information about places, activities, interests,",
     instruction=prompt.INSPIRATION_AGENT_INSTR,
     tools=[AgentTool(agent=place_agent), AgentTool(agent=poi_agent), map_tool],
+    before_tool_callback=state_write_filter.before_tool,
+    after_tool_callback=state_write_filter.after_tool,
 )
@@ -19,7 +19,8 @@ from google.adk.tools.agent_tool import AgentTool
 from google.genai.types import GenerateContentConfig
 from nomad_ai.shared_libraries import types
 from nomad_ai.sub_agents.planning import prompt
-from nomad_ai.tools.memory import memorize
+from nomad_ai.tools.memory import memorize_many
+from nomad_ai.tools.state_delta import state_write_filter
 
 
 itinerary_agent = Agent(
@@ -96,9 +97,11 @@ planning_agent = Agent(
         AgentTool(agent=hotel_search_agent),
         AgentTool(agent=hotel_room_selection_agent),
         AgentTool(agent=itinerary_agent),
-        memorize,
+        memorize_many,
     ],
     generate_content_config=GenerateContentConfig(
         temperature=0.1, top_p=0.5
-    )
+    ),
+    before_tool_callback=state_write_filter.before_tool,
+    after_tool_callback=state_write_filter.after_tool,
 )
@@ -32,7 +32,7 @@ You have access to the following tools only:
 - Use the `hotel_search_agent` tool to find hotel choices,
 - Use the `hotel_room_selection_agent` tool to find room choices,
 - Use the `itinerary_agent` tool to generate an itinerary, and
-- Use the `memorize` tool to remember the user's chosen selections.
+- Use the `memorize_many` tool to remember the user's chosen selections.
 
 
 How to support the user journeys:
@@ -66,13 +66,12 @@ Make sure you use the information that's already been filled above previously.
 - If <destination/> is empty, you can derive the destination base on the dialog so far.
 - Ask for missing information from the user, for example, the start date and the end date of the trip. 
 - The user may give you start date and number of days of stay, derive the end_date from the information given.
-- Use the `memorize` tool to store trip metadata into the following variables (dates in YYYY-MM-DD format);
+- Use one call to the `memorize_many` tool to store trip metadata into the following variables (dates in YYYY-MM-DD format);
   - `origin`, 
   - `destination`
   - `start_date` and 
   - `end_date`
-  To make sure everything is stored correctly, instead of calling memorize all at once, chain the calls such that 
-  you only call another `memorize` after the last call has responded. 
+  Pass every known value in the same call, keyed by its variable name.
 - Use instructions from <FIND_FLIGHTS/> to complete the flight and seat choices.
 - Use instructions from <FIND_HOTELS/> to complete the hotel and room choices.
 - Finally, use instructions from <CREATE_ITINERARY/> to generate an itinerary.
@@ -91,14 +90,15 @@ Your goal is to help the traveler reach the destination to enjoy these activitie
   - Call `flight_search_agent` and work with the user to select both outbound and inbound flights.
   - Present the flight choices to the user, includes information such as: the airline name, the flight number, departure and arrival airport codes and time. When user selects the flight...
   - Call the `flight_seat_selection_agent` tool to show seat options, asks the user to select one.
-  - Call the `memorize` tool to store the outbound and inbound flights and seats selections info into the following variables:
+  - Call the `memorize_many` tool to store the outbound and inbound flights and seats selections info into the following variables:
     - 'outbound_flight_selection' and 'outbound_seat_number'
     - 'return_flight_selection' and 'return_seat_number'
     - For flight choise, store the full JSON entries from the `flight_search_agent`'s prior response.  
+    - Store the flight and seat of a leg together in one `memorize_many` call, instead of one call per variable.
   - Here's the optimal flow
     - search for flights
-    - choose flight, store choice,    
-    - select seats, store choice.    
+    - choose flight, select seats,
+    - store both choices.    
 </FIND_FLIGHTS>
 
 <FIND_HOTELS>
@@ -111,13 +111,14 @@ Your goal is to help the traveler by  completing the following information if an
 - Given the derived destination and the interested activities,
   - Call `hotel_search_agent` and work with the user to select a hotel. When user select the hotel...
   - Call `hotel_room_selection_agent` to choose a room.
-  - Call the `memorize` tool to store the hotel and room selections into the following variables:
+  - Call the `memorize_many` tool to store the hotel and room selections into the following variables:
     - `hotel_selection` and `room_selection`
     - For hotel choice, store the chosen JSON entry from the `hotel_search_agent`'s prior response.  
+    - Store the hotel and room together in one `memorize_many` call, instead of one call per variable.
   - Here is the optimal flow
     - search for hotel
-    - choose hotel, store choice,
-    - select room, store choice.
+    - choose hotel, select room,
+    - store both choices.
 </FIND_HOTELS>
 
 <CREATE_ITINERARY>
@@ -140,7 +141,7 @@ Finally, once the supported user journey is completed, reconfirm with user, if t
 
 Please use the context info below for user preferences
   <user_profile>
-  {user_profile}
+  {user:user_profile}
   </user_profile>
 """
 
@@ -153,7 +154,7 @@ FLIGHT_SEARCH_INSTR = """Generate search results for flights from origin to dest
 
 Current user:
   <user_profile>
-  {user_profile}
+  {user:user_profile}
   </user_profile>
 
 Current time: {_time}
@@ -191,7 +192,7 @@ Remember that you can only use the tools to complete your tasks:
   - `hotel_search_agent`,
   - `hotel_room_selection_agent`,
   - `itinerary_agent`,
-  - `memorize`
+  - `memorize_many`
 
 """
 
@@ -287,7 +288,7 @@ HOTEL_SEARCH_INSTR = """Generate search results for hotels for hotel_location in
 
 Current user:
   <user_profile>
-  {user_profile}
+  {user:user_profile}
   </user_profile>
 
 Current time: {_time}
@@ -431,7 +432,8 @@ The JSON object captures the following information:
           "address": "85 Pike St, Seattle, WA 98101",
           "start_time": "09:00",
           "end_time": "12:00",
-          "booking_required": False
+          "booking_required": False,
+          "outdoor": True
         }},
         {{
           "event_type": "visit",
@@ -439,7 +441,8 @@ The JSON object captures the following information:
           "address": "1001 Alaskan Way, Pier 54, Seattle, WA 98104",
           "start_time": "12:30",
           "end_time": "13:30",
-          "booking_required": False
+          "booking_required": False,
+          "outdoor": False
         }},
         {{
           "event_type": "visit",
@@ -448,6 +451,7 @@ The JSON object captures the following information:
           "start_time": "14:30",
           "end_time": "16:30",
           "booking_required": True,
+          "outdoor": True,
           "price": "25",        
           "booking_id": ""
         }},
@@ -456,7 +460,8 @@ The JSON object captures the following information:
           "description": "Dinner in Capitol Hill",
           "address": "Capitol Hill, Seattle, WA",
           "start_time": "19:00",
-          "booking_required": False
+          "booking_required": False,
+          "outdoor": False
         }}
       ]
     }},
@@ -471,6 +476,7 @@ The JSON object captures the following information:
           "start_time": "10:00",
           "end_time": "13:00",
           "booking_required": True,
+          "outdoor": False,
           "price": "12",        
           "booking_id": ""
         }},
@@ -533,6 +539,7 @@ The JSON object captures the following information:
       }}
   - For activities or attraction visiting, include:
     - the anticipated start and end time for that activity on the day.
+    - 'outdoor'; true if the activity takes place outdoors, where the weather may impact it, e.g. a hike or a harbor cruise.
     - e.g. for an activity:
       {{
         "event_type": "visit",
@@ -541,6 +548,7 @@ The JSON object captures the following information:
         "start_time": "09:00",
         "end_time": "12:00",
         "booking_required": false,
+        "outdoor": true,
         "booking_id": ""
       }}
     - e.g. for free time, keep address empty:
@@ -551,6 +559,7 @@ The JSON object captures the following information:
         "start_time": "13:00",
         "end_time": "17:00",
         "booking_required": false,
+        "outdoor": true,
         "booking_id": ""
       }}
 """
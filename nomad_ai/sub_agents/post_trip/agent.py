@@ -17,12 +17,15 @@
 from google.adk.agents import Agent
 
 from nomad_ai.sub_agents.post_trip import prompt
-from nomad_ai.tools.memory import memorize
+from nomad_ai.tools.memory import memorize, memorize_many
+from nomad_ai.tools.state_delta import state_write_filter
 
 post_trip_agent = Agent(
     model="gemini-2.5-flash",
     name="post_trip_agent",
     description="A follow up agent to learn from user's experience; In turn improves the user's future trips planning and in-trip experience.",
     instruction=prompt.POSTTRIP_INSTR,
-    tools=[memorize],
+    tools=[memorize, memorize_many],
+    before_tool_callback=state_write_filter.before_tool,
+    after_tool_callback=state_write_filter.after_tool,
 )
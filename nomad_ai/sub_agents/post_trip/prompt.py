@@ -38,7 +38,7 @@ From user's answers, extract the following types of information and use it in th
 - Acitivities preferences
 - Business reviews and recommendations
 
-For every individually identified preferences, store their values using the `memorize` tool.
+Store the values of all the individually identified preferences with one call to the `memorize_many` tool.
 
 Finally, thank the user, and express that these feedback will be incorporated into their preferences for next time!
 """
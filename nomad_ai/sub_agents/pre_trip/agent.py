@@ -19,6 +19,7 @@ from google.adk.tools.agent_tool import AgentTool
 from nomad_ai.shared_libraries import types
 from nomad_ai.sub_agents.pre_trip import prompt
 from nomad_ai.tools.search import google_search_grounding
+from nomad_ai.tools.state_delta import state_write_filter
 
 
 what_to_pack_agent = Agent(
@@ -38,4 +39,6 @@ pre_trip_agent = Agent(
     description="Given an itinerary, this agent keeps up to date and provides relevant travel information to the user before the trip.",
     instruction=prompt.PRETRIP_AGENT_INSTR,
     tools=[google_search_grounding, AgentTool(agent=what_to_pack_agent)],
+    before_tool_callback=state_write_filter.before_tool,
+    after_tool_callback=state_write_filter.after_tool,
 )
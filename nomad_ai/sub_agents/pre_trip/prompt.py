@@ -26,7 +26,7 @@ Given the itinerary:
 
 and the user profile:
 <user_profile>
-{user_profile}
+{user:user_profile}
 </user_profile>
 
 If the itinerary is empty, inform the user that you can help once there is an itinerary, and asks to transfer the user back to the `inspiration_agent`.
@@ -0,0 +1,252 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Offline gazetteer of well-known places, consulted before the Places API.
+
+The index is a read-only SQLite file memory-mapped at load time. It maps the
+trigrams of every place name and alias to the place_id, lat/lng and address of
+the place. Build it from a CSV or JSON dump with:
+
+    python -m nomad_ai.tools.gazetteer build landmarks.csv gazetteer.sqlite3
+
+Records need the fields name, place_id, lat, lng and address; an optional
+aliases field holds alternative names, as a JSON list or separated by "|".
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+PLACES_GAZETTEER_PATH = os.getenv("PLACES_GAZETTEER_PATH", "")
+PLACES_GAZETTEER_THRESHOLD = float(os.getenv("PLACES_GAZETTEER_THRESHOLD", 0.85))
+
+# Weight of the name in the score when the query also carries an address.
+NAME_WEIGHT = 0.8
+# How many name candidates are re-scored against the address part of the query.
+MAX_CANDIDATES = 8
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text.casefold()).split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Returns the character trigrams of a normalized, space-padded text."""
+    padded = f"  {_normalize(text)} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(grams_a: Set[str], grams_b: Set[str]) -> float:
+    if not grams_a or not grams_b:
+        return 0.0
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+def _read_records(source_path: str) -> Iterable[Dict[str, Any]]:
+    with open(source_path, "r", newline="", encoding="utf-8") as file:
+        if source_path.endswith(".json"):
+            yield from json.load(file)
+        else:
+            yield from csv.DictReader(file)
+
+
+def _aliases(record: Dict[str, Any]) -> List[str]:
+    aliases = record.get("aliases") or []
+    if isinstance(aliases, str):
+        aliases = json.loads(aliases) if aliases.startswith("[") else aliases.split("|")
+    return [alias.strip() for alias in aliases if alias.strip()]
+
+
+def build_index(source_path: str, index_path: str) -> int:
+    """
+    Compiles a CSV or JSON dump of places into a gazetteer index.
+
+    Args:
+        source_path: The .csv or .json dump.
+        index_path: Where to write the index; an existing file is replaced.
+
+    Returns:
+        The number of places indexed.
+    """
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    conn = sqlite3.connect(index_path)
+    conn.executescript(
+        """
+        CREATE TABLE places (
+            id INTEGER PRIMARY KEY,
+            place_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            address TEXT NOT NULL,
+            lat TEXT NOT NULL,
+            lng TEXT NOT NULL
+        );
+        CREATE TABLE names (
+            id INTEGER PRIMARY KEY,
+            place INTEGER NOT NULL REFERENCES places(id),
+            gram_count INTEGER NOT NULL
+        );
+        CREATE TABLE grams (
+            gram TEXT NOT NULL,
+            name INTEGER NOT NULL,
+            PRIMARY KEY (gram, name)
+        ) WITHOUT ROWID;
+        """
+    )
+    count = 0
+    for record in _read_records(source_path):
+        place = conn.execute(
+            "INSERT INTO places (place_id, name, address, lat, lng) VALUES (?, ?, ?, ?, ?)",
+            (
+                record["place_id"],
+                record["name"],
+                record.get("address", ""),
+                str(record["lat"]),
+                str(record["lng"]),
+            ),
+        ).lastrowid
+        for name in [record["name"], *_aliases(record)]:
+            grams = trigrams(name)
+            name_id = conn.execute(
+                "INSERT INTO names (place, gram_count) VALUES (?, ?)", (place, len(grams))
+            ).lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO grams (gram, name) VALUES (?, ?)",
+                [(gram, name_id) for gram in grams],
+            )
+        count += 1
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+    return count
+
+
+class Gazetteer:
+    """
+    Fuzzy lookups of place names in a gazetteer index.
+
+    A query shaped like map_tool's "place_name, address" is matched on its name
+    part by trigram similarity. The address part, when present, also counts
+    towards the score, which tells apart places sharing a name and rejects a
+    famous name in the wrong city. Matches scoring below threshold are misses.
+    """
+
+    def __init__(self, path: str, threshold: float = PLACES_GAZETTEER_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            f"file:{path}?mode=ro&immutable=1", uri=True, check_same_thread=False
+        )
+        self._conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+
+    def lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Finds the place best matching a query.
+
+        Args:
+            query: A text query, e.g. "Space Needle, 400 Broad St, Seattle".
+
+        Returns:
+            The place record with its match score, or None if nothing scores
+            above the threshold.
+        """
+        name, _, address = query.partition(",")
+        name_grams = trigrams(name)
+        if not name_grams:
+            return None
+        grams = sorted(name_grams)
+
+        with self._lock:
+            candidates = self._conn.execute(
+                f"""
+                SELECT places.id, places.place_id, places.name, places.address,
+                       places.lat, places.lng,
+                       2.0 * COUNT(*) / (? + names.gram_count) AS score
+                FROM grams
+                JOIN names ON names.id = grams.name
+                JOIN places ON places.id = names.place
+                WHERE grams.gram IN ({",".join("?" * len(grams))})
+                GROUP BY names.id
+                ORDER BY score DESC
+                LIMIT ?
+                """,
+                (len(grams), *grams, MAX_CANDIDATES),
+            ).fetchall()
+
+            best, best_score = None, 0.0
+            address_grams = trigrams(address)
+            for _, place_id, place_name, place_address, lat, lng, score in candidates:
+                if len(address_grams) > 1:
+                    score = NAME_WEIGHT * score + (1 - NAME_WEIGHT) * _dice(
+                        address_grams, trigrams(place_address)
+                    )
+                if score > best_score:
+                    best_score = score
+                    best = {
+                        "place_id": place_id,
+                        "place_name": place_name,
+                        "place_address": place_address,
+                        "lat": lat,
+                        "lng": lng,
+                        "score": score,
+                    }
+
+            if best is None or best_score < self.threshold:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return best
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def load_default_gazetteer() -> Optional[Gazetteer]:
+    """Opens the index at PLACES_GAZETTEER_PATH, if one is configured and present."""
+    if PLACES_GAZETTEER_PATH and os.path.exists(PLACES_GAZETTEER_PATH):
+        return Gazetteer(PLACES_GAZETTEER_PATH)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gazetteer index tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Compile a CSV/JSON dump into an index")
+    build.add_argument("source", help="The .csv or .json dump of places")
+    build.add_argument("index", help="Path of the index to write")
+    query = subparsers.add_parser("query", help="Look up a query in an index")
+    query.add_argument("index", help="Path of the index to read")
+    query.add_argument("text", help='A query, e.g. "Space Needle, Seattle"')
+    args = parser.parse_args()
+
+    if args.command == "build":
+        count = build_index(args.source, args.index)
+        print(f"Indexed {count} places into {args.index}")
+    else:
+        print(Gazetteer(args.index).lookup(args.text))
+
+
+if __name__ == "__main__":
+    main()
@@ -14,21 +14,188 @@
 
 """The 'memorize' tool for several agents to affect session states."""
 
+from collections import OrderedDict
 from datetime import datetime
 import json
 import os
-from typing import Dict, Any
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, Hashable, Iterable, List, Mapping, Optional, Tuple
 
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.sessions.state import State
 from google.adk.tools import ToolContext
+from pydantic import ValidationError
 
 from nomad_ai.shared_libraries import constants
+from nomad_ai.shared_libraries.tracing import get_tracer
+from nomad_ai.shared_libraries.types import MemoryItem
+from nomad_ai.tools.profiles import load_default_profile_repository
+from nomad_ai.tools.state_delta import state_write_filter
+
+tracer = get_tracer(__name__)
 
 SAMPLE_SCENARIO_PATH = os.getenv(
     "SAMPLE_ITINERARY_SCENARIO", "nomad_ai/profiles/itinerary_empty_default.json"
 )
 
+# Caps the lists kept by memorize_list, dropping the oldest values first; 0 keeps everything.
+MEMORY_LIST_MAX_LEN = int(os.getenv("MEMORY_LIST_MAX_LEN", 0))
+
+# Stored profiles by user_id, when PROFILE_STORE is configured.
+profile_repository = load_default_profile_repository()
+
+# Scenario keys stored under the user's scope rather than in each session.
+_SCOPED_SCENARIO_KEYS = {constants.LEGACY_PROF_KEY: constants.PROF_KEY}
+
+# Parsed scenario "state" templates by path, with the mtime they were read at.
+_scenario_templates: Dict[str, Tuple[int, Mapping[str, Any]]] = {}
+_scenario_templates_lock = threading.Lock()
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("Shared session state is read-only, edit writable(state, key) instead")
+
+
+class SharedDict(dict):
+    """
+    A read-only dict from a scenario template, shared by every session.
+
+    Copies return the same object, so sessions kept in this process, e.g. by
+    InMemorySessionService, reference one template in memory until they first
+    write to it; see writable. Serializing gives a plain copy, so persisted
+    events and database-backed session stores still hold the full values.
+    """
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce_ex__(self, protocol):
+        return dict, (dict(self),)
+
+
+class SharedList(list):
+    """A read-only list from a scenario template, shared by every session."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return SharedDict((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return SharedList(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def writable(state: State | dict[str, Any], key: str) -> Any:
+    """
+    Returns state[key] ready to be edited in place.
+
+    A value still shared with the scenario template is copied into the session
+    first, so the session only ever holds its own copy of the keys it changes.
+
+    Args:
+        state: The session state.
+        key: A key present in the state.
+
+    Returns:
+        The session's own, mutable value of the key.
+    """
+    value = state[key]
+    if isinstance(value, (SharedDict, SharedList)):
+        value = _thaw(value)
+        state[key] = value
+    return value
+
+
+_MISSING = object()
+
+
+def _index_key(value: Any) -> Hashable:
+    try:
+        hash(value)
+        return value
+    except TypeError:  # A dict or list value, e.g. from a scenario template.
+        return json.dumps(value, sort_keys=True, default=str)
+
+
+class ListMemory:
+    """
+    An ordered set over the values of a list kept in the session state.
+
+    Once built, membership, adding and removing are O(1). The state itself
+    keeps a plain list, so load the values with ListMemory(state.get(key)) and
+    store them back with to_list(); both are linear in the list length.
+
+    Args:
+        values: The current values, oldest first.
+        max_len: If set, adding beyond it drops the oldest values first.
+    """
+
+    def __init__(self, values: Optional[Iterable[Any]] = None, max_len: Optional[int] = None):
+        self.max_len = max_len
+        self._values: OrderedDict[Hashable, Any] = OrderedDict()
+        self.add_all(values or [])
+
+    def __contains__(self, value: Any) -> bool:
+        return _index_key(value) in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values.values())
+
+    def add(self, value: Any) -> bool:
+        """Appends a value unless already present; returns whether it was added."""
+        index_key = _index_key(value)
+        if index_key in self._values:
+            return False
+        self._values[index_key] = value
+        if self.max_len and len(self._values) > self.max_len:
+            self._values.popitem(last=False)
+        return True
+
+    def add_all(self, values: Iterable[Any]) -> int:
+        """Appends the values not already present; returns how many were added."""
+        return sum(self.add(value) for value in values)
+
+    def discard(self, value: Any) -> bool:
+        """Removes a value if present; returns whether it was removed."""
+        return self._values.pop(_index_key(value), _MISSING) is not _MISSING
+
+    def discard_all(self, values: Iterable[Any]) -> int:
+        """Removes the values present; returns how many were removed."""
+        return sum(self.discard(value) for value in values)
+
+    def to_list(self) -> List[Any]:
+        return list(self._values.values())
+
 
 def memorize_list(key: str, value: str, tool_context: ToolContext):
     """
@@ -42,11 +209,9 @@ def memorize_list(key: str, value: str, tool_context: ToolContext):
     Returns:
         A status message.
     """
-    mem_dict = tool_context.state
-    if key not in mem_dict:
-        mem_dict[key] = []
-    if value not in mem_dict[key]:
-        mem_dict[key].append(value)
+    values = ListMemory(tool_context.state.get(key), max_len=MEMORY_LIST_MAX_LEN or None)
+    if values.add(value) or key not in tool_context.state:
+        tool_context.state[key] = values.to_list()
     return {"status": f'Stored "{key}": "{value}"'}
 
 
@@ -67,6 +232,38 @@ def memorize(key: str, value: str, tool_context: ToolContext):
     return {"status": f'Stored "{key}": "{value}"'}
 
 
+def memorize_many(items: List[MemoryItem], tool_context: ToolContext):
+    """
+    Memorize several pieces of information at once, in a single update.
+
+    Args:
+        items: the values to store, each with the label to store it under.
+        tool_context: The ADK tool context.
+
+    Returns:
+        A status message.
+    """
+    if not items:
+        return {"status": "Nothing to store"}
+    # The model's arguments arrive as plain dicts.
+    validated, malformed = [], []
+    for item in items:
+        try:
+            validated.append(MemoryItem.model_validate(item))
+        except ValidationError:
+            malformed.append(item)
+    if malformed:
+        return {"status": f"Nothing stored, keys and values must be text: {malformed}"}
+    items = validated
+    invalid = [item.key for item in items if not item.key]
+    if invalid:
+        return {"status": f"Nothing stored, invalid keys: {invalid}"}
+
+    values = {item.key: item.value for item in items}
+    tool_context.state.update(values)
+    return {"status": f"Stored {', '.join(f'{key!r}' for key in values)}"}
+
+
 def forget(key: str, value: str, tool_context: ToolContext):
     """
     Forget pieces of information.
@@ -79,19 +276,67 @@ def forget(key: str, value: str, tool_context: ToolContext):
     Returns:
         A status message.
     """
-    if tool_context.state[key] is None:
-        tool_context.state[key] = []
-    if value in tool_context.state[key]:
-        tool_context.state[key].remove(value)
+    values = ListMemory(tool_context.state.get(key))
+    removed = values.discard(value)
+    if removed:
+        tool_context.state[key] = values.to_list()
+    if not removed:
+        return {"status": f'Nothing to remove, "{key}" does not hold "{value}"'}
     return {"status": f'Removed "{key}": "{value}"'}
 
 
-def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
+def get_user_profile(state: State | dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the user profile, wherever the session keeps it.
+
+    Args:
+        state: The session state.
+
+    Returns:
+        The user-scoped profile, or the per-session copy of older sessions.
+    """
+    profile = state.get(constants.PROF_KEY)
+    if profile is None:
+        profile = state.get(constants.LEGACY_PROF_KEY)
+    return profile or {}
+
+
+def _load_scenario(path: str) -> Mapping[str, Any]:
+    """
+    Returns the initial states of a scenario file, parsing it only once per path and mtime.
+
+    The template is shared by every session and read-only, down to its nested
+    values; sessions reference it until they write to it.
+
+    Args:
+        path: The scenario JSON file.
+
+    Returns:
+        A read-only view of the scenario's "state" object.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    with _scenario_templates_lock:
+        cached = _scenario_templates.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, "r") as file:
+            template = MappingProxyType(_freeze(json.load(file)["state"]))
+        _scenario_templates[path] = (mtime, template)
+        return template
+
+
+def _set_initial_states(source: Mapping[str, Any], target: State | dict[str, Any]):
     """
     Setting the initial session state given a JSON object of states.
 
+    The user profile goes to user-scoped state, and user: and app: keys are only
+    set when the user or the app does not have them yet. Every key set is part
+    of the state delta, and so of the session's first event: only the values
+    held in memory are shared with the template, not what a session store saves.
+
     Args:
-        source: A JSON object of states.
+        source: A JSON object of states; its values are shared, never modified.
         target: The session state object to insert into.
     """
     if constants.SYSTEM_TIME not in target:
@@ -100,7 +345,11 @@ def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
     if constants.ITIN_INITIALIZED not in target:
         target[constants.ITIN_INITIALIZED] = True
 
-        target.update(source)
+        for key, value in source.items():
+            key = _SCOPED_SCENARIO_KEYS.get(key, key)
+            if key.startswith(constants.SHARED_STATE_PREFIXES) and key in target:
+                continue  # Already stored for the user or the app; keep their current value.
+            target[key] = value
 
         itinerary = source.get(constants.ITIN_KEY, {})
         if itinerary:
@@ -118,18 +367,38 @@ def _load_precreated_itinerary(callback_context: CallbackContext):
     Args:
         callback_context: The callback context.
     """
+    state = callback_context.state
+    if constants.PROF_KEY not in state and constants.LEGACY_PROF_KEY in state:
+        # Sessions created before the profile moved to user-scoped state only
+        # have the per-session copy, which the prompts no longer reference.
+        state[constants.PROF_KEY] = state[constants.LEGACY_PROF_KEY]
+    if constants.ITIN_INITIALIZED in state and constants.SYSTEM_TIME in state:
+        return  # This session was set up on an earlier turn.
+
     # Sample code for fetching session id from CallbackContext
     inv_context = callback_context._invocation_context
     session_obj = inv_context.session
     session_id = session_obj.id
     user_id = session_obj.user_id
 
-    #print(f"Session ID: {session_id}")
-    #print(f"User ID: {user_id}")
-    
-    data = {}
-    with open(SAMPLE_SCENARIO_PATH, "r") as file:
-        data = json.load(file)
-        print(f"\nLoading Initial State: {data}\n")
+    tracer.debug(
+        "session_setup", session_id=session_id, user_id=user_id, scenario=SAMPLE_SCENARIO_PATH
+    )
+
+    _set_initial_states(_load_scenario(SAMPLE_SCENARIO_PATH), state)
+
+    if profile_repository is not None:
+        profile = profile_repository.get(user_id)
+        if profile is not None and state.get(constants.PROF_KEY) != profile:
+            state[constants.PROF_KEY] = profile
+
+
+def _save_user_profile(tool_context: ToolContext, changes: Dict[str, Any]):
+    """Queues the profile changes made by a tool for write-back to the profile store."""
+    if constants.PROF_KEY in changes:
+        user_id = tool_context._invocation_context.session.user_id
+        profile_repository.put(user_id, changes[constants.PROF_KEY])
+
 
-    _set_initial_states(data["state"], callback_context.state)
+if profile_repository is not None:
+    state_write_filter.add_listener(_save_user_profile)
@@ -14,15 +14,75 @@
 
 """Wrapper to Google Maps Places API."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import os
-from typing import Dict, List, Any
+import threading
+from typing import Dict, List, Any, Optional, Tuple
 
 from google.adk.tools import ToolContext
+import httpx
 import requests
 
+from nomad_ai.tools.gazetteer import Gazetteer, load_default_gazetteer
+from nomad_ai.tools.memory import writable
+from nomad_ai.tools.places_cache import (
+    GeocodeCache,
+    PLACES_CACHE_PATH,
+    NO_PLACES_FOUND,
+    is_cacheable,
+    normalize_query,
+)
+from nomad_ai.tools.places_transport import AsyncPlacesTransport, PlacesTransport
+from nomad_ai.tools.rate_limit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INSPIRATION,
+    RateLimiter,
+    RateLimitTimeout,
+)
+from nomad_ai.tools.singleflight import AsyncSingleFlight, SingleFlight
+
+# Override to point the services at a stand-in server, e.g. tests/places_standin.py.
+PLACES_API_BASE_URL = os.getenv("GOOGLE_PLACES_API_BASE_URL", "https://maps.googleapis.com")
+
+# Upper bound on concurrent Places API requests issued by one batch lookup.
+PLACES_BATCH_MAX_WORKERS = int(os.getenv("PLACES_BATCH_MAX_WORKERS", 8))
+
+# Budget for refreshing stale cache entries in the background: at most this many
+# at once, each giving up unless Places quota frees up within the deadline.
+# Refreshes also queue behind all foreground lookups (PRIORITY_BACKGROUND).
+PLACES_REVALIDATE_MAX_IN_FLIGHT = int(os.getenv("PLACES_REVALIDATE_MAX_IN_FLIGHT", 2))
+PLACES_REVALIDATE_DEADLINE = float(os.getenv("PLACES_REVALIDATE_DEADLINE", 0.5))
+
+# POI field recording which name and address the place_id/lat/long were looked up for.
+GEOCODE_FINGERPRINT = "geocode_fingerprint"
 
-class PlacesService:
-    """Wrapper to Placees API."""
+
+class _PlacesApi:
+    """Request building, response parsing and caching shared by the sync and async services."""
+
+    def __init__(
+        self,
+        cache: Optional[GeocodeCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        priority: int = PRIORITY_INSPIRATION,
+        base_url: str = PLACES_API_BASE_URL,
+        gazetteer: Optional[Gazetteer] = None,
+        revalidate_max_in_flight: int = PLACES_REVALIDATE_MAX_IN_FLIGHT,
+        revalidate_deadline: float = PLACES_REVALIDATE_DEADLINE,
+    ):
+        self.places_url = base_url.rstrip("/") + "/maps/api/place/findplacefromtext/json"
+        self.cache = cache
+        self.gazetteer = gazetteer
+        self.revalidate_max_in_flight = revalidate_max_in_flight
+        self.revalidate_deadline = revalidate_deadline
+        self._revalidating = set()
+        self._revalidating_lock = threading.Lock()
+        self.revalidations = 0
+        self.revalidations_skipped = 0
+        self.rate_limiter = rate_limiter
+        self.priority = priority
 
     def _check_key(self):
         if (
@@ -31,48 +91,118 @@ class PlacesService:
             # https://developers.google.com/maps/documentation/places/web-service/get-api-key
             self.places_api_key = os.getenv("GOOGLE_PLACES_API_KEY")
 
-    def find_place_from_text(self, query: str) -> Dict[str, str]:
-        """Fetches place details using a text query."""
+    def _request_params(self, query: str) -> Dict[str, str]:
+        """Builds the Find Place query string for a text query."""
         self._check_key()
-        places_url = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
-        params = {
+        return {
             "input": query,
             "inputtype": "textquery",
             "fields": "place_id,formatted_address,name,photos,geometry",
             "key": self.places_api_key,
         }
 
-        try:
-            response = requests.get(places_url, params=params)
-            response.raise_for_status()
-            place_data = response.json()
-
-            if not place_data.get("candidates"):
-                return {"error": "No places found."}
-
-            # Extract data for the first candidate
-            place_details = place_data["candidates"][0]
-            place_id = place_details["place_id"]
-            place_name = place_details["name"]
-            place_address = place_details["formatted_address"]
-            photos = self.get_photo_urls(place_details.get("photos", []), maxwidth=400)
-            map_url = self.get_map_url(place_id)
-            location = place_details["geometry"]["location"]
-            lat = str(location["lat"])
-            lng = str(location["lng"])
+    def _parse_place_data(self, place_data: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Extracts the first candidate of a Find Place response.
+
+        Photos are kept as references, which is also how they are cached, so that
+        the API key never lands in the cache; _with_photo_urls turns them into URLs.
+        """
+        if not place_data.get("candidates"):
+            return {"error": NO_PLACES_FOUND}
+
+        # Extract data for the first candidate
+        place_details = place_data["candidates"][0]
+        place_id = place_details["place_id"]
+        place_name = place_details["name"]
+        place_address = place_details["formatted_address"]
+        photo_references = [photo["photo_reference"] for photo in place_details.get("photos", [])]
+        map_url = self.get_map_url(place_id)
+        location = place_details["geometry"]["location"]
+        lat = str(location["lat"])
+        lng = str(location["lng"])
+
+        return {
+            "place_id": place_id,
+            "place_name": place_name,
+            "place_address": place_address,
+            "photo_references": photo_references,
+            "map_url": map_url,
+            "lat": lat,
+            "lng": lng,
+        }
+
+    def _with_photo_urls(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns a result with its photo references turned into URLs carrying the current API key."""
+        if "photo_references" not in result:
+            return result
+        self._check_key()
+        result = dict(result)
+        photos = [{"photo_reference": reference} for reference in result.pop("photo_references")]
+        result["photos"] = self.get_photo_urls(photos, maxwidth=400)
+        return result
+
+    def _local_get(self, query: str) -> Tuple[Optional[Dict[str, str]], bool]:
+        """
+        Answers a query from the offline gazetteer, then the cache, without any network call.
+
+        Returns:
+            The result, or None, and whether it is a stale cache entry to revalidate.
+        """
+        if self.gazetteer is not None:
+            place = self.gazetteer.lookup(query)
+            if place is not None:
+                return {
+                    "place_id": place["place_id"],
+                    "place_name": place["place_name"],
+                    "place_address": place["place_address"],
+                    "photos": [],
+                    "map_url": self.get_map_url(place["place_id"]),
+                    "lat": place["lat"],
+                    "lng": place["lng"],
+                }, False
+        entry = self.cache.get_entry(query) if self.cache is not None else None
+        if entry is None:
+            return None, False
+        return entry.value, entry.is_stale
+
+    def _claim_revalidation(self, key: str) -> bool:
+        """Reserves a revalidation slot for a key, unless it is taken or the budget is spent."""
+        with self._revalidating_lock:
+            if key in self._revalidating or len(self._revalidating) >= self.revalidate_max_in_flight:
+                self.revalidations_skipped += 1
+                return False
+            self._revalidating.add(key)
+            self.revalidations += 1
+            return True
+
+    def _release_revalidation(self, key: str):
+        with self._revalidating_lock:
+            self._revalidating.discard(key)
 
+    def revalidation_stats(self) -> Dict[str, Any]:
+        """Returns how many background refreshes were started, skipped, and are running."""
+        with self._revalidating_lock:
             return {
-                "place_id": place_id,
-                "place_name": place_name,
-                "place_address": place_address,
-                "photos": photos,
-                "map_url": map_url,
-                "lat": lat,
-                "lng": lng,
+                "revalidations": self.revalidations,
+                "skipped": self.revalidations_skipped,
+                "in_flight": len(self._revalidating),
             }
 
-        except requests.exceptions.RequestException as e:
-            return {"error": f"Error fetching place data: {e}"}
+    def _cache_put(self, query: str, result: Dict[str, str]):
+        if self.cache is not None and is_cacheable(result):
+            self.cache.put(query, result)
+
+    def _rate_limited(self, e: RateLimitTimeout) -> Dict[str, str]:
+        return {"error": f"Error fetching place data: {e}"}
+
+    @staticmethod
+    def _unique_queries(queries: List[str]) -> Dict[str, str]:
+        """Maps each normalized key to the first query spelled that way."""
+        unique = {}
+        for query in queries:
+            unique.setdefault(normalize_query(query), query)
+        return unique
 
     def get_photo_urls(self, photos: List[Dict[str, Any]], maxwidth: int = 400) -> List[str]:
         """Extracts photo URLs from the 'photos' list."""
@@ -87,38 +217,334 @@ class PlacesService:
         return f"https://www.google.com/maps/place/?q=place_id:{place_id}"
 
 
-# Google Places API
-places_service = PlacesService()
+class PlacesService(_PlacesApi):
+    """Wrapper to Placees API."""
+
+    def __init__(
+        self,
+        cache: Optional[GeocodeCache] = None,
+        transport: Optional[PlacesTransport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        priority: int = PRIORITY_INSPIRATION,
+        base_url: str = PLACES_API_BASE_URL,
+        gazetteer: Optional[Gazetteer] = None,
+    ):
+        super().__init__(
+            cache=cache,
+            rate_limiter=rate_limiter,
+            priority=priority,
+            base_url=base_url,
+            gazetteer=gazetteer,
+        )
+        self.transport = transport if transport is not None else PlacesTransport()
+        self.single_flight = SingleFlight()
+        self._revalidator = ThreadPoolExecutor(
+            max_workers=max(1, self.revalidate_max_in_flight),
+            thread_name_prefix="places-revalidate",
+        )
+
+    def find_place_from_text(self, query: str, priority: Optional[int] = None) -> Dict[str, str]:
+        """
+        Fetches place details using a text query, consulting the gazetteer and cache first.
+        Concurrent misses for the same normalized query share one API request,
+        which waits for rate limiter quota in the given priority class.
+        Stale cache entries are returned at once and refreshed in the background.
+        """
+        local, stale = self._local_get(query)
+        if local is not None:
+            if stale:
+                self._revalidate(query)
+            return self._with_photo_urls(local)
+
+        return self.single_flight.do(
+            normalize_query(query), self._fetch_and_cache, query, priority
+        )
+
+    def _fetch_and_cache(self, query: str, priority: Optional[int]) -> Dict[str, str]:
+        if self.rate_limiter is not None:
+            try:
+                self.rate_limiter.acquire(self.priority if priority is None else priority)
+            except RateLimitTimeout as e:
+                return self._rate_limited(e)
+        result = self._fetch_place_from_text(query)
+        self._cache_put(query, result)
+        return self._with_photo_urls(result)
 
+    def _revalidate(self, query: str):
+        key = normalize_query(query)
+        if self._claim_revalidation(key):
+            self._revalidator.submit(self._revalidate_now, query, key)
 
-def map_tool(key: str, tool_context: ToolContext):
+    def _revalidate_now(self, query: str, key: str):
+        """Refreshes a stale entry; on any failure the stale entry stays in place."""
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(PRIORITY_BACKGROUND, deadline=self.revalidate_deadline)
+            self._cache_put(query, self._fetch_place_from_text(query))
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
+        finally:
+            self._release_revalidation(key)
+
+    def find_places_from_text(
+        self,
+        queries: List[str],
+        max_workers: int = PLACES_BATCH_MAX_WORKERS,
+        priority: Optional[int] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Fetches place details for a batch of text queries.
+
+        Queries that normalize to the same key are looked up only once, and the
+        unique lookups run concurrently on at most max_workers threads.
+        A failing lookup yields an {"error": ...} entry instead of failing the batch.
+
+        Args:
+            queries: The text queries to geocode.
+            max_workers: Maximum number of concurrent lookups.
+            priority: The rate limiter priority class; defaults to the service's.
+
+        Returns:
+            One result per query, in the same order as the queries.
+        """
+        unique = self._unique_queries(queries)
+        if not unique:
+            return []
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique)))) as pool:
+            found = pool.map(
+                lambda query: self._safe_find_place_from_text(query, priority), unique.values()
+            )
+            results = dict(zip(unique, found))
+        return [results[normalize_query(query)] for query in queries]
+
+    def _safe_find_place_from_text(self, query: str, priority: Optional[int]) -> Dict[str, str]:
+        """find_place_from_text that reports unexpected failures as an error result."""
+        try:
+            return self.find_place_from_text(query, priority)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return {"error": f"Error fetching place data: {e}"}
+
+    def _fetch_place_from_text(self, query: str) -> Dict[str, str]:
+        """Fetches place details from the Places API."""
+        try:
+            response = self.transport.get(self.places_url, params=self._request_params(query))
+            response.raise_for_status()
+            return self._parse_place_data(response.json())
+
+        except requests.exceptions.RequestException as e:
+            return {"error": f"Error fetching place data: {e}"}
+
+
+class AsyncPlacesService(_PlacesApi):
+    """Wrapper to Places API for asyncio callers, such as the tools run by the ADK runner."""
+
+    def __init__(
+        self,
+        cache: Optional[GeocodeCache] = None,
+        transport: Optional[AsyncPlacesTransport] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        priority: int = PRIORITY_INSPIRATION,
+        base_url: str = PLACES_API_BASE_URL,
+        gazetteer: Optional[Gazetteer] = None,
+    ):
+        super().__init__(
+            cache=cache,
+            rate_limiter=rate_limiter,
+            priority=priority,
+            base_url=base_url,
+            gazetteer=gazetteer,
+        )
+        self.transport = transport if transport is not None else AsyncPlacesTransport()
+        self.single_flight = AsyncSingleFlight()
+        self._revalidation_tasks = set()
+
+    async def find_place_from_text(
+        self, query: str, priority: Optional[int] = None
+    ) -> Dict[str, str]:
+        """
+        Fetches place details using a text query, consulting the gazetteer and cache first.
+        Concurrent misses for the same normalized query share one API request,
+        which waits for rate limiter quota in the given priority class.
+        Stale cache entries are returned at once and refreshed in a background task.
+        """
+        local, stale = self._local_get(query)
+        if local is not None:
+            if stale:
+                self._revalidate(query)
+            return self._with_photo_urls(local)
+
+        return await self.single_flight.do(
+            normalize_query(query), self._fetch_and_cache, query, priority
+        )
+
+    async def _fetch_and_cache(self, query: str, priority: Optional[int]) -> Dict[str, str]:
+        if self.rate_limiter is not None:
+            try:
+                await self.rate_limiter.acquire_async(
+                    self.priority if priority is None else priority
+                )
+            except RateLimitTimeout as e:
+                return self._rate_limited(e)
+        result = await self._fetch_place_from_text(query)
+        self._cache_put(query, result)
+        return self._with_photo_urls(result)
+
+    def _revalidate(self, query: str):
+        key = normalize_query(query)
+        if self._claim_revalidation(key):
+            # Keep a reference so the task is not garbage collected while running.
+            task = asyncio.get_running_loop().create_task(self._revalidate_now(query, key))
+            self._revalidation_tasks.add(task)
+            task.add_done_callback(self._revalidation_tasks.discard)
+
+    async def _revalidate_now(self, query: str, key: str):
+        """Refreshes a stale entry; on any failure the stale entry stays in place."""
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(
+                    PRIORITY_BACKGROUND, deadline=self.revalidate_deadline
+                )
+            self._cache_put(query, await self._fetch_place_from_text(query))
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
+        finally:
+            self._release_revalidation(key)
+
+    async def find_places_from_text(
+        self,
+        queries: List[str],
+        max_concurrency: int = PLACES_BATCH_MAX_WORKERS,
+        priority: Optional[int] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Fetches place details for a batch of text queries.
+
+        Same contract as PlacesService.find_places_from_text, with the unique
+        lookups running as at most max_concurrency concurrent coroutines.
+
+        Args:
+            queries: The text queries to geocode.
+            max_concurrency: Maximum number of concurrent lookups.
+            priority: The rate limiter priority class; defaults to the service's.
+
+        Returns:
+            One result per query, in the same order as the queries.
+        """
+        unique = self._unique_queries(queries)
+        if not unique:
+            return []
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def lookup(query: str) -> Dict[str, str]:
+            async with semaphore:
+                try:
+                    return await self.find_place_from_text(query, priority)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    return {"error": f"Error fetching place data: {e}"}
+
+        found = await asyncio.gather(*(lookup(query) for query in unique.values()))
+        results = dict(zip(unique, found))
+        return [results[normalize_query(query)] for query in queries]
+
+    async def _fetch_place_from_text(self, query: str) -> Dict[str, str]:
+        """Fetches place details from the Places API."""
+        try:
+            response = await self.transport.get(self.places_url, params=self._request_params(query))
+            response.raise_for_status()
+            return self._parse_place_data(response.json())
+
+        except httpx.HTTPError as e:
+            return {"error": f"Error fetching place data: {e}"}
+
+
+# Google Places API, backed by the on-disk geocode cache unless PLACES_CACHE_PATH is empty.
+# Each service owns one pooled keep-alive client, shared by every call.
+# Both services draw from one token bucket, this package's own: nomad_ai_in_trip,
+# when loaded in the same process, keeps a separate one. Only the inspiration agent
+# looks places up, at the services' default PRIORITY_INSPIRATION.
+# Well-known landmarks are answered from the offline gazetteer when PLACES_GAZETTEER_PATH is set.
+_geocode_cache = GeocodeCache() if PLACES_CACHE_PATH else None
+_gazetteer = load_default_gazetteer()
+places_rate_limiter = RateLimiter()
+places_service = PlacesService(
+    cache=_geocode_cache, rate_limiter=places_rate_limiter, gazetteer=_gazetteer
+)
+async_places_service = AsyncPlacesService(
+    cache=_geocode_cache, rate_limiter=places_rate_limiter, gazetteer=_gazetteer
+)
+
+
+def poi_fingerprint(poi: Dict[str, Any]) -> str:
+    """A digest of the fields a POI is geocoded from, to detect changed entries."""
+    location = normalize_query(poi["place_name"] + ", " + poi["address"])
+    return hashlib.sha1(location.encode()).hexdigest()
+
+
+def _is_verified(poi: Dict[str, Any], fingerprint: str) -> bool:
+    """Whether a POI was geocoded by an earlier call and has not changed since."""
+    return (
+        poi.get(GEOCODE_FINGERPRINT) == fingerprint
+        and bool(poi.get("place_id"))
+        and bool(poi.get("lat"))
+        and bool(poi.get("long"))
+    )
+
+
+async def map_tool(key: str, tool_context: ToolContext):
     """
     This is going to inspect the pois stored under the specified key in the state.
-    One by one it will retrieve the accurate Lat/Lon from the Map API, if the Map API is available for use.
+    It retrieves the accurate Lat/Lon of the POIs from the Map API in one batch, if the Map API is available for use.
+    POIs already verified by an earlier call, whose name and address have not changed, are left as they are.
 
     Args:
         key: The key under which the POIs are stored.
         tool_context: The ADK tool context.
         
     Returns:
-        The updated state with the full JSON object under the key.
+        The updated state with the full JSON object under the key,
+        plus the POIs that could not be verified and why, and how many lookups were skipped.
     """
     if key not in tool_context.state:
         tool_context.state[key] = {}
 
     # The pydantic object types.POISuggestions
     if "places" not in tool_context.state[key]:
-        tool_context.state[key]["places"] = []
+        writable(tool_context.state, key)["places"] = []
 
     pois = tool_context.state[key]["places"]
-    for poi in pois:  # The pydantic object types.POI
-        location = poi["place_name"] + ", " + poi["address"]
-        result = places_service.find_place_from_text(location)
+    fingerprints = [poi_fingerprint(poi) for poi in pois]
+    stale = [
+        (i, fingerprint)
+        for i, (poi, fingerprint) in enumerate(zip(pois, fingerprints))
+        if not _is_verified(poi, fingerprint)
+    ]
+    if stale:
+        value = writable(tool_context.state, key)
+        pois = value["places"]
+    results = await async_places_service.find_places_from_text(
+        [pois[i]["place_name"] + ", " + pois[i]["address"] for i, _ in stale]
+    )
+
+    failures = []
+    for (i, fingerprint), result in zip(stale, results):  # The pydantic object types.POI
+        poi = pois[i]
         # Fill the place holders with verified information.
         poi["place_id"] = result["place_id"] if "place_id" in result else None
         poi["map_url"] = result["map_url"] if "map_url" in result else None
         if "lat" in result and "lng" in result:
             poi["lat"] = result["lat"]
             poi["long"] = result["lng"]
+        if "error" in result:
+            failures.append({"place_name": poi["place_name"], "error": result["error"]})
+            poi.pop(GEOCODE_FINGERPRINT, None)
+        else:
+            poi[GEOCODE_FINGERPRINT] = fingerprint
+    if stale:
+        # A plain dict, e.g. written by an agent's output_key, was edited in
+        # place; setting it again records the edit in the state delta.
+        tool_context.state[key] = value
 
-    return {"places": pois}  # Return the updated pois
+    # Return the updated pois
+    return {"places": pois, "failures": failures, "skipped": len(pois) - len(stale)}
@@ -0,0 +1,211 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pooled, retrying HTTP transport for the Places API wrapper."""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, Any
+import weakref
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+PLACES_POOL_SIZE = int(os.getenv("PLACES_POOL_SIZE", 10))
+PLACES_CONNECT_TIMEOUT = float(os.getenv("PLACES_CONNECT_TIMEOUT", 3.05))
+PLACES_READ_TIMEOUT = float(os.getenv("PLACES_READ_TIMEOUT", 10))
+PLACES_MAX_RETRIES = int(os.getenv("PLACES_MAX_RETRIES", 3))
+PLACES_BACKOFF_BASE = float(os.getenv("PLACES_BACKOFF_BASE", 0.25))
+PLACES_BACKOFF_MAX = float(os.getenv("PLACES_BACKOFF_MAX", 4.0))
+
+# Throttling and transient server errors are worth another attempt.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2^attempt)]."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class PlacesTransport:
+    """
+    A keep-alive requests.Session shared by every Places API call.
+
+    Connections to maps.googleapis.com are pooled and reused across calls and
+    threads. Requests time out after (connect_timeout, read_timeout), and
+    connection errors, timeouts and 429/5xx answers are retried with jittered
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = PLACES_POOL_SIZE,
+        connect_timeout: float = PLACES_CONNECT_TIMEOUT,
+        read_timeout: float = PLACES_READ_TIMEOUT,
+        max_retries: int = PLACES_MAX_RETRIES,
+        backoff_base: float = PLACES_BACKOFF_BASE,
+        backoff_max: float = PLACES_BACKOFF_MAX,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.retries = 0
+
+    def get(self, url: str, params: Dict[str, Any]) -> requests.Response:
+        """
+        Issues a GET request, retrying transient failures.
+
+        Args:
+            url: The endpoint to call.
+            params: The query string parameters.
+
+        Returns:
+            The last response received; it may still carry a 429/5xx status
+            once retries are exhausted.
+
+        Raises:
+            requests.exceptions.RequestException: if the last attempt failed
+                to produce a response at all.
+        """
+        attempt = 0
+        while True:
+            with self._lock:
+                self.attempts += 1
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                response.close()
+
+            with self._lock:
+                self.retries += 1
+            time.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns attempt/retry counters and how often pooled connections were reused."""
+        pools = self._adapter.poolmanager.pools
+        connections = requests_sent = 0
+        for pool_key in pools.keys():
+            pool = pools.get(pool_key)
+            if pool is not None:
+                connections += pool.num_connections
+                requests_sent += pool.num_requests
+        return {
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "connections_opened": connections,
+            "requests_sent": requests_sent,
+            "connection_reuse_rate": (
+                1 - connections / requests_sent if requests_sent else 0.0
+            ),
+        }
+
+
+class AsyncPlacesTransport:
+    """
+    The asyncio counterpart of PlacesTransport, built on httpx.AsyncClient.
+
+    httpx clients are bound to the event loop they were first used on, so one
+    pooled client is kept per running loop. Timeouts and the retry policy are
+    the same as PlacesTransport.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = PLACES_POOL_SIZE,
+        connect_timeout: float = PLACES_CONNECT_TIMEOUT,
+        read_timeout: float = PLACES_READ_TIMEOUT,
+        max_retries: int = PLACES_MAX_RETRIES,
+        backoff_base: float = PLACES_BACKOFF_BASE,
+        backoff_max: float = PLACES_BACKOFF_MAX,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._clients = weakref.WeakKeyDictionary()
+        self.attempts = 0
+        self.retries = 0
+
+    def client(self) -> httpx.AsyncClient:
+        """Returns the pooled client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+            self._clients[loop] = client
+        return client
+
+    async def get(self, url: str, params: Dict[str, Any]) -> httpx.Response:
+        """
+        Issues a GET request, retrying transient failures.
+
+        Args:
+            url: The endpoint to call.
+            params: The query string parameters.
+
+        Returns:
+            The last response received; it may still carry a 429/5xx status
+            once retries are exhausted.
+
+        Raises:
+            httpx.HTTPError: if the last attempt failed to produce a response at all.
+        """
+        client = self.client()
+        attempt = 0
+        while True:
+            self.attempts += 1
+            try:
+                response = await client.get(url, params=params)
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+
+            self.retries += 1
+            await asyncio.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
+            attempt += 1
+
+    async def aclose(self):
+        """Closes the client of the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns attempt/retry counters."""
+        return {"attempts": self.attempts, "retries": self.retries}
@@ -0,0 +1,371 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Read-through cache of user profiles stored in the user_preferences table.
+
+Profiles are read from, and written back to, user_preferences.profile_data
+(see database/cloud_sql_schema.sql). The table's updated_at column serves as
+the profile version: a cached profile past its TTL is revalidated by reading
+the version alone, and only reloaded when it changed.
+"""
+
+import atexit
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from nomad_ai.shared_libraries.tracing import get_tracer
+
+tracer = get_tracer(__name__)
+
+# "" disables the store, "toolbox" reads through the MCP Toolbox, anything else is a SQLite file.
+PROFILE_STORE = os.getenv("PROFILE_STORE", "")
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", 300))
+PROFILE_CACHE_MAX_ENTRIES = int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", 10000))
+# Pending profile updates are written back once this many have queued, or after the delay.
+PROFILE_FLUSH_BATCH = int(os.getenv("PROFILE_FLUSH_BATCH", 50))
+PROFILE_FLUSH_DELAY = float(os.getenv("PROFILE_FLUSH_DELAY", 2.0))
+
+MCP_TOOLBOX_URL = os.getenv(
+    "MCP_TOOLBOX_URL", "https://toolbox-632735824953.us-central1.run.app"
+)
+
+
+class VersionedProfile(NamedTuple):
+    """A profile with the version it was stored under."""
+
+    profile: Dict[str, Any]
+    version: str
+
+
+# Seconds since the epoch, with sub-millisecond precision.
+_SQLITE_NOW = "((julianday('now') - 2440587.5) * 86400.0)"
+
+
+class SqliteProfileBackend:
+    """
+    The user_preferences table in a local SQLite file, standing in for Cloud SQL.
+
+    updated_at holds epoch seconds and grows on every update, even on updates
+    within the same clock tick, so that it can serve as the profile version.
+
+    Args:
+        path: The SQLite file; ":memory:" keeps the table in memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS user_preferences (
+                user_id TEXT PRIMARY KEY,
+                profile_data TEXT,
+                created_at REAL DEFAULT {_SQLITE_NOW},
+                updated_at REAL DEFAULT {_SQLITE_NOW}
+            )
+            """
+        )
+        self._conn.commit()
+
+    def load(self, user_id: str) -> Optional[VersionedProfile]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT profile_data, updated_at FROM user_preferences WHERE user_id = ?",
+                (user_id,),
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return VersionedProfile(json.loads(row[0]), repr(row[1]))
+
+    def version(self, user_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT updated_at FROM user_preferences WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        return repr(row[0]) if row else None
+
+    def save_many(self, profiles: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        with self._lock:
+            self._conn.executemany(
+                f"""
+                INSERT INTO user_preferences (user_id, profile_data) VALUES (?, ?)
+                ON CONFLICT (user_id) DO UPDATE SET
+                    profile_data = excluded.profile_data,
+                    updated_at = max({_SQLITE_NOW}, updated_at + 0.000001)
+                """,
+                [(user_id, json.dumps(profile)) for user_id, profile in profiles.items()],
+            )
+            self._conn.commit()
+            rows = self._conn.execute(
+                f"""
+                SELECT user_id, updated_at FROM user_preferences
+                WHERE user_id IN ({",".join("?" * len(profiles))})
+                """,
+                list(profiles),
+            ).fetchall()
+        return {user_id: repr(updated_at) for user_id, updated_at in rows}
+
+
+class ToolboxProfileBackend:
+    """
+    The user_preferences table in Cloud SQL, through the MCP Toolbox tools of
+    the nomad-ai-profile-tools toolset (database/mcp_toolbox_tools_minimal.yaml).
+    """
+
+    def __init__(self, url: str = MCP_TOOLBOX_URL):
+        self.url = url
+        self._client = None
+        self._tools = {}
+        self._lock = threading.Lock()
+
+    def _tool(self, name: str):
+        with self._lock:
+            if name not in self._tools:
+                if self._client is None:
+                    from toolbox_core import ToolboxSyncClient  # pylint: disable=import-outside-toplevel
+
+                    self._client = ToolboxSyncClient(self.url)
+                self._tools[name] = self._client.load_tool(name)
+            return self._tools[name]
+
+    @staticmethod
+    def _rows(result: str) -> List[Dict[str, Any]]:
+        rows = json.loads(result) if result else None
+        return rows or []
+
+    def load(self, user_id: str) -> Optional[VersionedProfile]:
+        rows = self._rows(self._tool("get-user-profile")(user_id=user_id))
+        if not rows or rows[0]["profile_data"] is None:
+            return None
+        profile = rows[0]["profile_data"]
+        if isinstance(profile, str):
+            profile = json.loads(profile)
+        return VersionedProfile(profile, str(rows[0]["updated_at"]))
+
+    def version(self, user_id: str) -> Optional[str]:
+        rows = self._rows(self._tool("get-user-profile-version")(user_id=user_id))
+        return str(rows[0]["updated_at"]) if rows else None
+
+    def save_many(self, profiles: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        rows = self._rows(self._tool("save-user-profiles")(profiles=json.dumps(profiles)))
+        return {row["user_id"]: str(row["updated_at"]) for row in rows}
+
+
+class _CachedProfile:
+    def __init__(self, profile: Optional[Dict[str, Any]], version: Optional[str]):
+        self.profile = profile
+        self.version = version
+        self.checked_at = time.monotonic()
+
+
+class ProfileRepository:
+    """
+    Read-through TTL/LRU cache of user profiles, with batched write-back.
+
+    Cached profiles are served for ttl seconds. After that, the next read
+    compares the cached version with the stored one and only reloads the
+    profile if it changed. Updates are served from the cache right away and
+    queued; the queue is written back in one batch once it holds flush_batch
+    profiles, flush_delay seconds after the first update, or at exit.
+    Write-backs run on a timer thread, never in the caller's; a failed one is
+    logged and retried flush_delay seconds later.
+
+    Args:
+        backend: Loads and stores profiles, e.g. SqliteProfileBackend.
+        ttl: Seconds a cached profile is served without revalidation.
+        max_entries: Profiles kept in memory; the least recently used saved ones go first.
+        flush_batch: Pending updates that trigger an immediate write-back.
+        flush_delay: Seconds an update waits at most before being written back.
+    """
+
+    def __init__(
+        self,
+        backend,
+        ttl: float = PROFILE_CACHE_TTL,
+        max_entries: int = PROFILE_CACHE_MAX_ENTRIES,
+        flush_batch: int = PROFILE_FLUSH_BATCH,
+        flush_delay: float = PROFILE_FLUSH_DELAY,
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.flush_batch = flush_batch
+        self.flush_delay = flush_delay
+        self._lock = threading.RLock()
+        # Keeps batches in order, so an older update never overwrites a newer one.
+        self._flush_lock = threading.Lock()
+        self._cache: OrderedDict[str, _CachedProfile] = OrderedDict()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+
+        self.hits = 0
+        self.revalidated = 0
+        self.loads = 0
+        self.flushes = 0
+        self.written = 0
+        atexit.register(self.flush)
+
+    def _store(self, user_id: str, entry: _CachedProfile):
+        self._cache[user_id] = entry
+        self._cache.move_to_end(user_id)
+        excess = len(self._cache) - self.max_entries
+        if excess > 0:
+            # Unsaved updates stay readable: only saved profiles are evicted.
+            evicted = []
+            for cached_id in self._cache:
+                if len(evicted) == excess:
+                    break
+                if cached_id not in self._pending:
+                    evicted.append(cached_id)
+            for cached_id in evicted:
+                del self._cache[cached_id]
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns a user's profile.
+
+        Args:
+            user_id: The user to look up.
+
+        Returns:
+            The profile, or None if the user has none stored.
+        """
+        with self._lock:
+            entry = self._cache.get(user_id)
+            if entry is not None:
+                self._cache.move_to_end(user_id)
+                if user_id in self._pending or time.monotonic() - entry.checked_at < self.ttl:
+                    self.hits += 1
+                    return entry.profile
+
+        if entry is not None and self.backend.version(user_id) == entry.version:
+            with self._lock:
+                entry.checked_at = time.monotonic()
+                self.revalidated += 1
+            return entry.profile
+
+        stored = self.backend.load(user_id)
+        with self._lock:
+            self.loads += 1
+            if user_id in self._pending:  # Updated while loading; the update wins.
+                return self._pending[user_id]
+            self._store(
+                user_id,
+                _CachedProfile(*stored) if stored else _CachedProfile(None, None),
+            )
+        return stored.profile if stored else None
+
+    def put(self, user_id: str, profile: Dict[str, Any]):
+        """
+        Updates a user's profile, to be written back with the next batch.
+
+        Args:
+            user_id: The user to update.
+            profile: The full new profile.
+        """
+        with self._lock:
+            self._pending[user_id] = profile
+            self._store(user_id, _CachedProfile(profile, None))
+            self._schedule_flush(0 if len(self._pending) >= self.flush_batch else self.flush_delay)
+
+    def _schedule_flush(self, delay: float):
+        """Writes the pending updates back in delay seconds, unless already due sooner."""
+        with self._lock:
+            if self._flush_timer is not None:
+                if self._flush_timer.interval <= delay:
+                    return
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(delay, self._flush_in_background)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # The updates are queued again, and retried by the timer flush re-armed.
+            tracer.warning("profile_flush_failed", error=repr(e), pending=len(self._pending))
+
+    def invalidate(self, user_id: str):
+        """Drops a user's cached profile, so that the next read loads it again."""
+        with self._lock:
+            if user_id not in self._pending:
+                self._cache.pop(user_id, None)
+
+    def flush(self) -> int:
+        """
+        Writes the pending updates back in one batch.
+
+        If the write fails, the updates are queued again and a retry is
+        scheduled flush_delay seconds later, then the error is raised.
+
+        Returns:
+            The number of profiles written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            try:
+                versions = self.backend.save_many(pending)
+            except Exception:
+                with self._lock:  # Retry with the next batch, unless updated since.
+                    for user_id, profile in pending.items():
+                        self._pending.setdefault(user_id, profile)
+                    self._schedule_flush(self.flush_delay)
+                raise
+
+            with self._lock:
+                for user_id, version in versions.items():
+                    entry = self._cache.get(user_id)
+                    if entry is not None and user_id not in self._pending:
+                        entry.version = version
+                        entry.checked_at = time.monotonic()
+                self.flushes += 1
+                self.written += len(pending)
+            return len(pending)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns cache and write-back counters."""
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "loads": self.loads,
+                "pending": len(self._pending),
+                "flushes": self.flushes,
+                "written": self.written,
+            }
+
+
+def load_default_profile_repository() -> Optional[ProfileRepository]:
+    """Opens the profile store configured by PROFILE_STORE, if any."""
+    if not PROFILE_STORE:
+        return None
+    if PROFILE_STORE == "toolbox":
+        return ProfileRepository(ToolboxProfileBackend())
+    return ProfileRepository(SqliteProfileBackend(PROFILE_STORE))
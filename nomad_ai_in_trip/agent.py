@@ -21,12 +21,11 @@ from nomad_ai_in_trip import prompt
 
 from nomad_ai_in_trip.tools_intrip import (
     transit_coordination,
-    flight_status_check,
-    event_booking_check,
-    weather_impact_check,
+    monitor_trip,
 )
 
 from nomad_ai_in_trip.tools.memory import memorize
+from nomad_ai_in_trip.tools.state_delta import state_write_filter
 
 
 # This sub-agent is expected to be called every day closer to the trip, and frequently several times a day during the trip.
@@ -43,7 +42,7 @@ trip_monitor_agent = Agent(
     name="trip_monitor_agent",
     description="Monitor aspects of a itinerary and bring attention to items that necessitate changes",
     instruction=prompt.TRIP_MONITOR_INSTR,
-    tools=[flight_status_check, event_booking_check, weather_impact_check],
+    tools=[monitor_trip],
     output_key="daily_checks",  # can be sent via email.
 )
 
@@ -60,4 +59,6 @@ root_agent = Agent(
         AgentTool(agent=day_of_agent), 
         memorize
     ],
+    before_tool_callback=state_write_filter.before_tool,
+    after_tool_callback=state_write_filter.after_tool,
 )
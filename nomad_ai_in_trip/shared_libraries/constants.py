@@ -17,8 +17,14 @@
 SYSTEM_TIME = "_time"
 ITIN_INITIALIZED = "_itin_initialized"
 
+# Prefixes of the state keys ADK stores once per user or per app instead of per session.
+SHARED_STATE_PREFIXES = ("user:", "app:")
+
 ITIN_KEY = "itinerary"
-PROF_KEY = "user_profile"
+# Stored once per user and visible to all of the user's sessions.
+PROF_KEY = "user:user_profile"
+# Where sessions created before the profile moved to user state keep it.
+LEGACY_PROF_KEY = "user_profile"
 
 ITIN_START_DATE = "itinerary_start_date"
 ITIN_END_DATE = "itinerary_end_date"
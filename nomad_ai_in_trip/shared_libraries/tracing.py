@@ -0,0 +1,216 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Structured trace events, sampled per logger and written off the calling thread.
+
+Modules trace through a tracer named after them:
+
+    tracer = get_tracer(__name__)
+    tracer.debug("find_segment", current_datetime=current_datetime)
+
+Events below the level of their logger cost one level check. The events
+that pass it are kept at the sampling rate of their logger and handed to the
+application's log handlers. With TRACE_SINK set to a stream instead, they are
+queued as they are, and a background thread, started with the first event,
+formats each one as a JSON line and writes it out. Since the fields are
+formatted after the call returns, pass values that are not edited afterwards.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+# Hot-path events are traced at DEBUG and the checks at INFO. Unset, the package's
+# loggers keep the level the application configures, WARNING by default.
+TRACE_LEVEL = os.getenv("TRACE_LEVEL", "")
+# Comma-separated logger=rate pairs, e.g. "nomad_ai.sub_agents.in_trip=0.1"; a rate
+# also applies to the logger's children. Warnings and errors are never sampled out.
+TRACE_SAMPLING = os.getenv("TRACE_SAMPLING", "")
+# "logging" hands events to the application's log handlers; "stderr" or "stdout"
+# writes them there, off the calling thread, and keeps them from the application's.
+TRACE_SINK = os.getenv("TRACE_SINK", "logging")
+# Events waiting for the sink; events traced while it is full are dropped.
+TRACE_QUEUE_SIZE = int(os.getenv("TRACE_QUEUE_SIZE", 10000))
+
+ROOT_LOGGER = __name__.split(".")[0]
+
+
+def _parse_sampling(spec: str) -> Dict[str, float]:
+    rates = {}
+    for pair in spec.split(","):
+        if pair.strip():
+            name, _, rate = pair.partition("=")
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+SAMPLE_RATES = _parse_sampling(TRACE_SAMPLING)
+
+
+def sample_rate(name: str, rates: Optional[Dict[str, float]] = None) -> float:
+    """Returns the sampling rate of a logger: that of its closest configured ancestor."""
+    rates = SAMPLE_RATES if rates is None else rates
+    parts = name.split(".")
+    for i in range(len(parts), 0, -1):
+        rate = rates.get(".".join(parts[:i]))
+        if rate is not None:
+            return rate
+    return 1.0
+
+
+class TraceEvent:
+    """An event and its fields, formatted as a JSON line only when written."""
+
+    __slots__ = ("event", "fields")
+
+    def __init__(self, event: str, fields: Dict[str, Any]):
+        self.event = event
+        self.fields = fields
+
+    def __str__(self) -> str:
+        return json.dumps({"event": self.event, **self.fields}, default=str)
+
+
+class Tracer:
+    """
+    Emits the trace events of one logger.
+
+    Args:
+        name: The logger name, usually the module's __name__.
+        rate: The fraction of DEBUG and INFO events kept.
+    """
+
+    def __init__(self, name: str, rate: float = 1.0):
+        self.logger = logging.getLogger(name)
+        self.rate = rate
+        self.sampled_out = 0
+
+    def enabled(self, level: int) -> bool:
+        """Whether events of a level are traced; guards fields that are costly to compute."""
+        return self.logger.isEnabledFor(level)
+
+    def event(self, level: int, event: str, **fields: Any):
+        """
+        Traces an event.
+
+        Args:
+            level: The logging level, e.g. logging.DEBUG.
+            event: A short name of what happened, e.g. "flight_status_check".
+            **fields: The structured details of the event.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        if level < logging.WARNING and self.rate < 1.0 and random.random() >= self.rate:
+            self.sampled_out += 1
+            return
+        self.logger.log(level, TraceEvent(event, fields))
+
+    def debug(self, event: str, **fields: Any):
+        self.event(logging.DEBUG, event, **fields)
+
+    def info(self, event: str, **fields: Any):
+        self.event(logging.INFO, event, **fields)
+
+    def warning(self, event: str, **fields: Any):
+        self.event(logging.WARNING, event, **fields)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records unformatted, and drops them rather than wait when the queue is full.
+
+    Args:
+        record_queue: The queue of records.
+        sink: If set, the handler a background thread writes the queued records
+            to; the thread starts with the first record.
+    """
+
+    def __init__(self, record_queue: queue.Queue, sink: Optional[logging.Handler] = None):
+        super().__init__(record_queue)
+        self.sink = sink
+        self.dropped = 0
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._listener_lock = threading.Lock()
+
+    def _start_listener(self):
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = logging.handlers.QueueListener(self.queue, self.sink)
+                self._listener.start()
+                atexit.register(self._listener.stop)  # Writes out the queued events.
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # QueueHandler formats records in the calling thread; leave that to the sink.
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.sink is not None and self._listener is None:
+            self._start_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_tracers: Dict[str, Tracer] = {}
+_handler: Optional[DroppingQueueHandler] = None
+
+
+def _configure():
+    global _handler
+    root = logging.getLogger(ROOT_LOGGER)
+    if TRACE_LEVEL:
+        root.setLevel(TRACE_LEVEL.upper())
+    if TRACE_SINK == "logging":
+        return
+    sink = logging.StreamHandler(sys.stdout if TRACE_SINK == "stdout" else sys.stderr)
+    sink.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    _handler = DroppingQueueHandler(queue.Queue(TRACE_QUEUE_SIZE), sink)
+    root.addHandler(_handler)
+    root.propagate = False  # The events already go to the stream.
+
+
+def get_tracer(name: str) -> Tracer:
+    """
+    Returns the tracer of a logger, with the sampling rate configured for it.
+
+    Args:
+        name: The logger name, usually the module's __name__.
+    """
+    with _lock:
+        tracer = _tracers.get(name)
+        if tracer is None:
+            tracer = _tracers[name] = Tracer(name, sample_rate(name))
+        return tracer
+
+
+def stats() -> Dict[str, Any]:
+    """Returns how many events were sampled out or dropped on a full queue."""
+    with _lock:
+        return {
+            "sampled_out": sum(tracer.sampled_out for tracer in _tracers.values()),
+            "dropped": _handler.dropped if _handler is not None else 0,
+        }
+
+
+_configure()
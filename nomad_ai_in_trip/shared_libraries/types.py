@@ -148,6 +148,10 @@ class AttractionEvent(BaseModel):
     start_time: str = Field(description="Time in HH:MM format, e.g. 16:00")
     end_time: str = Field(description="Time in HH:MM format, e.g. 16:00")
     booking_required: bool = Field(default=False)
+    outdoor: bool = Field(
+        default=False,
+        description="Whether the activity takes place outdoors, where the weather may impact it",
+    )
     price: Optional[str] = Field(description="Some events may cost money")
 
 
@@ -229,3 +233,9 @@ class UserProfile(BaseModel):
 class PackingList(BaseModel):
     """A list of things to pack for the trip."""
     items: list[str]
+
+
+class MemoryItem(BaseModel):
+    """A piece of information to memorize."""
+    key: str = Field(description="The label to store the value under, e.g. origin")
+    value: str = Field(description="The information to store, e.g. Seattle")
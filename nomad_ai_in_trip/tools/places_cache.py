@@ -0,0 +1,203 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Disk-backed cache of geocoding results for the Places API wrapper."""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Any, NamedTuple, Optional
+
+# The same default file is used by the nomad_ai and nomad_ai_in_trip copies,
+# so both agents share one cache on a given host.
+PLACES_CACHE_PATH = os.getenv(
+    "PLACES_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "nomad_ai_places_cache.sqlite3"),
+)
+PLACES_CACHE_TTL = float(os.getenv("PLACES_CACHE_TTL", 30 * 24 * 3600))
+# Entries older than this are still served, but refreshed in the background.
+PLACES_CACHE_FRESH_TTL = float(os.getenv("PLACES_CACHE_FRESH_TTL", 7 * 24 * 3600))
+PLACES_CACHE_NEGATIVE_TTL = float(os.getenv("PLACES_CACHE_NEGATIVE_TTL", 24 * 3600))
+PLACES_CACHE_MAX_ENTRIES = int(os.getenv("PLACES_CACHE_MAX_ENTRIES", 50000))
+
+NO_PLACES_FOUND = "No places found."
+
+
+class CacheEntry(NamedTuple):
+    """A cached result with its freshness metadata."""
+
+    value: Dict[str, Any]
+    fetched_at: float
+    fresh_until: float
+    expires_at: float
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the entry is past its fresh period and due for revalidation."""
+        return time.time() >= self.fresh_until
+
+
+def normalize_query(query: str) -> str:
+    """Normalizes a text query so trivially different spellings share a key."""
+    return " ".join(query.casefold().replace(",", " , ").split())
+
+
+class GeocodeCache:
+    """
+    SQLite-backed cache of find_place_from_text results.
+
+    Entries expire after a per-entry TTL, and the least recently used entries
+    are evicted once the cache grows past max_entries. "No places found."
+    answers are cached as well, with their own (shorter) TTL.
+
+    Each entry records when it was fetched. Past fresh_ttl it is stale: still
+    served, but callers are expected to revalidate it.
+    """
+
+    def __init__(
+        self,
+        path: str = PLACES_CACHE_PATH,
+        ttl: float = PLACES_CACHE_TTL,
+        negative_ttl: float = PLACES_CACHE_NEGATIVE_TTL,
+        max_entries: int = PLACES_CACHE_MAX_ENTRIES,
+        fresh_ttl: float = PLACES_CACHE_FRESH_TTL,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.fresh_ttl = fresh_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS geocode (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                fetched_at REAL NOT NULL,
+                fresh_until REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_geocode_last_access ON geocode(last_access)"
+        )
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached result for a query, or None on a miss."""
+        entry = self.get_entry(query)
+        return entry.value if entry is not None else None
+
+    def get_entry(self, query: str) -> Optional[CacheEntry]:
+        """Returns the cached result for a query with its freshness metadata, or None on a miss."""
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, fetched_at, fresh_until, expires_at FROM geocode WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None or row[3] <= now:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE geocode SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            if row[2] <= now:
+                self.stale_hits += 1
+        return CacheEntry(json.loads(row[0]), row[1], row[2], row[3])
+
+    def put(self, query: str, result: Dict[str, Any], ttl: Optional[float] = None):
+        """
+        Stores a result for a query.
+
+        Args:
+            query: The text query that was geocoded.
+            result: The find_place_from_text result.
+            ttl: Seconds the entry stays valid; defaults to the cache TTL, or to
+                the negative TTL for "No places found." results.
+        """
+        if ttl is None:
+            ttl = self.negative_ttl if is_negative(result) else self.ttl
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode "
+                "(key, value, expires_at, last_access, fetched_at, fresh_until) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    normalize_query(query),
+                    json.dumps(result),
+                    now + ttl,
+                    now,
+                    now,
+                    now + min(ttl, self.fresh_ttl),
+                ),
+            )
+            self._evict()
+
+    def _evict(self):
+        """Once over max_entries, drops expired entries, then the least recently used."""
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()
+        if count <= self.max_entries:
+            return
+        self._conn.execute("DELETE FROM geocode WHERE expires_at <= ?", (time.time(),))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM geocode WHERE key IN "
+                "(SELECT key FROM geocode ORDER BY last_access ASC LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self):
+        """Removes every entry and resets the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM geocode")
+            self.hits = 0
+            self.misses = 0
+            self.stale_hits = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns hit/miss counters, including stale hits, and the current number of entries."""
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM geocode").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": count,
+        }
+
+
+def is_negative(result: Dict[str, Any]) -> bool:
+    """Whether a result is the "No places found." answer worth caching."""
+    return result.get("error") == NO_PLACES_FOUND
+
+
+def is_cacheable(result: Dict[str, Any]) -> bool:
+    """Transport errors are transient and never cached; everything else is."""
+    return "error" not in result or is_negative(result)
@@ -0,0 +1,182 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Token-bucket rate limiting with priority queueing for outbound API calls."""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+PLACES_QPS = float(os.getenv("PLACES_QPS", 50))
+PLACES_BURST = float(os.getenv("PLACES_BURST", 100))
+PLACES_QUEUE_DEADLINE = float(os.getenv("PLACES_QUEUE_DEADLINE", 10))
+
+# Priority classes, most urgent first.
+PRIORITY_IN_TRIP = 0
+PRIORITY_INSPIRATION = 1
+PRIORITY_BACKGROUND = 2
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a caller's deadline passes before a token is available."""
+
+
+class _Waiter:
+    """A queued caller waiting for a token."""
+
+    def __init__(self):
+        self.granted = False
+        self.cancelled = False
+
+
+class RateLimiter:
+    """
+    A token bucket with priority queueing, shared by the services given it.
+
+    Tokens refill at qps up to burst. When none are left, callers queue and are
+    served in (priority, arrival) order, so a lower priority value always goes
+    first. A caller gives up with RateLimitTimeout once its deadline passes.
+
+    The same limiter serves threads (acquire) and coroutines (acquire_async):
+    coroutines poll the bucket without ever blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        qps: float = PLACES_QPS,
+        burst: float = PLACES_BURST,
+        deadline: float = PLACES_QUEUE_DEADLINE,
+    ):
+        self.qps = qps
+        self.burst = burst
+        self.deadline = deadline
+        self._tokens = burst
+        self._refilled_at = time.monotonic()
+        self._cond = threading.Condition()
+        self._queue = []
+        self._arrivals = itertools.count()
+
+        self.granted = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.max_queue_depth = 0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.qps)
+        self._refilled_at = now
+
+    def _grant_queued(self):
+        """Hands out available tokens to queued waiters, most urgent first."""
+        while self._queue and self._tokens >= 1:
+            _, _, waiter = heapq.heappop(self._queue)
+            if waiter.cancelled:
+                continue
+            waiter.granted = True
+            self._tokens -= 1
+        self._cond.notify_all()
+
+    def _enqueue(self, priority: int) -> _Waiter:
+        waiter = _Waiter()
+        heapq.heappush(self._queue, (priority, next(self._arrivals), waiter))
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        return waiter
+
+    def _poll(self, waiter: _Waiter, now: float) -> Optional[float]:
+        """Returns None once the waiter holds a token, otherwise seconds until the next one."""
+        self._refill(now)
+        self._grant_queued()
+        if waiter.granted:
+            return None
+        return max((1 - self._tokens) / self.qps, 0.001)
+
+    def _record(self, started: float, granted: bool):
+        waited = time.monotonic() - started
+        if granted:
+            self.granted += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        else:
+            self.timed_out += 1
+
+    def acquire(self, priority: int = PRIORITY_INSPIRATION, deadline: Optional[float] = None):
+        """
+        Blocks until a token is available.
+
+        Args:
+            priority: The priority class; lower values are served first.
+            deadline: Seconds to wait at most; defaults to the limiter's deadline.
+
+        Raises:
+            RateLimitTimeout: if no token was granted before the deadline.
+        """
+        started = time.monotonic()
+        give_up_at = started + (self.deadline if deadline is None else deadline)
+        with self._cond:
+            waiter = self._enqueue(priority)
+            while True:
+                now = time.monotonic()
+                retry_in = self._poll(waiter, now)
+                if retry_in is None:
+                    self._record(started, granted=True)
+                    return
+                if now >= give_up_at:
+                    waiter.cancelled = True
+                    self._record(started, granted=False)
+                    raise RateLimitTimeout(f"No Places API quota within {give_up_at - started:.1f}s")
+                self._cond.wait(min(retry_in, give_up_at - now))
+
+    async def acquire_async(
+        self, priority: int = PRIORITY_INSPIRATION, deadline: Optional[float] = None
+    ):
+        """The coroutine version of acquire; waits with asyncio.sleep instead of blocking."""
+        started = time.monotonic()
+        give_up_at = started + (self.deadline if deadline is None else deadline)
+        with self._cond:
+            waiter = self._enqueue(priority)
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                retry_in = self._poll(waiter, now)
+                if retry_in is None:
+                    self._record(started, granted=True)
+                    return
+                if now >= give_up_at:
+                    waiter.cancelled = True
+                    self._record(started, granted=False)
+                    raise RateLimitTimeout(f"No Places API quota within {give_up_at - started:.1f}s")
+            try:
+                await asyncio.sleep(min(retry_in, give_up_at - now))
+            except asyncio.CancelledError:
+                with self._cond:
+                    if waiter.granted:  # Give the token back to the next caller.
+                        self._tokens += 1
+                    waiter.cancelled = True
+                raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns queue depth and wait time metrics."""
+        with self._cond:
+            return {
+                "queue_depth": sum(1 for _, _, w in self._queue if not w.cancelled),
+                "max_queue_depth": self.max_queue_depth,
+                "granted": self.granted,
+                "timed_out": self.timed_out,
+                "mean_wait": self.total_wait / self.granted if self.granted else 0.0,
+                "max_wait": self.max_wait,
+            }
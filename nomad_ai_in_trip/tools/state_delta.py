@@ -0,0 +1,291 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Suppression of no-op session state writes made by tools, and state size budgets."""
+
+from collections import OrderedDict
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from google.adk.tools import BaseTool, ToolContext
+
+# Tool calls whose state snapshot is kept; bounds the snapshots of calls that raised.
+MAX_PENDING_CALLS = 1024
+
+# Bytes of session state allowed before the least recently written keys are evicted; 0 disables eviction.
+STATE_BUDGET_BYTES = int(os.getenv("STATE_BUDGET_BYTES", 0))
+# Keys never evicted, on top of the "_" system keys and the "app:" and "user:" scoped keys.
+STATE_PINNED_KEYS = os.getenv(
+    "STATE_PINNED_KEYS",
+    "itinerary,user_profile,itinerary_datetime,itinerary_start_date,itinerary_end_date",
+).split(",")
+# Sessions whose key usage is tracked in memory; the least recently written ones are forgotten.
+STATE_BUDGET_MAX_SESSIONS = int(os.getenv("STATE_BUDGET_MAX_SESSIONS", 10000))
+
+_MISSING = object()
+
+
+def serialize(value: Any) -> bytes:
+    """The canonical JSON encoding of a state value; equal contents encode equally."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+class _KeyUsage:
+    """The size history of one state key."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.first_size = size
+        self.writes = 0
+        self.written_at = time.time()
+
+
+class StateBudget:
+    """
+    Per-session byte accounting of state keys, with an optional size budget.
+
+    Sizes are those of the canonical JSON encoding of each value. Once a
+    session's state grows past budget bytes, its least recently written keys
+    are cleared to None until it fits again. Pinned keys, keys starting with
+    "_", and keys scoped to the app or the user are never cleared, nor are the
+    keys written by the current tool call.
+    """
+
+    def __init__(
+        self,
+        budget: int = STATE_BUDGET_BYTES,
+        pinned_keys: Optional[List[str]] = None,
+        max_sessions: int = STATE_BUDGET_MAX_SESSIONS,
+    ):
+        self.budget = budget
+        self.pinned_keys = set(STATE_PINNED_KEYS if pinned_keys is None else pinned_keys)
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        # Session id -> keys in least recently written first order.
+        self._sessions: OrderedDict[str, OrderedDict[str, _KeyUsage]] = OrderedDict()
+        self._evicted: Dict[str, List[str]] = {}
+
+    def is_pinned(self, key: str) -> bool:
+        return key in self.pinned_keys or key.startswith(("_", "app:", "user:"))
+
+    def _usage(self, session_id: str, state: Dict[str, Any]) -> OrderedDict:
+        usage = self._sessions.get(session_id)
+        if usage is None:
+            # First sight of the session: account what it already holds.
+            usage = self._sessions[session_id] = OrderedDict(
+                (key, _KeyUsage(len(serialize(value))))
+                for key, value in state.items()
+                if not key.startswith("temp:")
+            )
+            while len(self._sessions) > self.max_sessions:
+                evicted_id, _ = self._sessions.popitem(last=False)
+                self._evicted.pop(evicted_id, None)
+        self._sessions.move_to_end(session_id)
+        return usage
+
+    def account(self, tool_context: ToolContext, sizes: Dict[str, int]) -> List[str]:
+        """
+        Records the sizes of the keys written by a tool call and enforces the budget.
+
+        Args:
+            tool_context: The context of the tool call; evictions are written to its state.
+            sizes: The encoded sizes of the values the call wrote, by key.
+
+        Returns:
+            The keys evicted to bring the session back within its budget.
+        """
+        session = tool_context._invocation_context.session
+        with self._lock:
+            usage = self._usage(session.id, session.state)
+            for key, size in sizes.items():
+                if key.startswith("temp:"):
+                    continue
+                entry = usage.get(key)
+                if entry is None:
+                    entry = usage[key] = _KeyUsage(size)
+                entry.size = size
+                entry.writes += 1
+                entry.written_at = time.time()
+                usage.move_to_end(key)
+
+            evicted = []
+            total = sum(entry.size for entry in usage.values())
+            if self.budget and total > self.budget:
+                for key, entry in usage.items():
+                    if total <= self.budget:
+                        break
+                    if self.is_pinned(key) or key in sizes or session.state.get(key) is None:
+                        continue
+                    total -= entry.size
+                    evicted.append(key)
+            for key in evicted:
+                usage[key].size = len(serialize(None))
+                self._evicted.setdefault(session.id, []).append(key)
+
+        for key in evicted:
+            tool_context.state[key] = None
+        return evicted
+
+    def report(self, session_id: str, top: int = 10) -> Dict[str, Any]:
+        """
+        Describes the state size of a session.
+
+        Args:
+            session_id: The session to describe.
+            top: How many of the largest keys to list.
+
+        Returns:
+            The total size and budget, the largest keys with their size, growth
+            since first seen and number of writes, and the keys evicted so far.
+        """
+        with self._lock:
+            usage = self._sessions.get(session_id, {})
+            largest = sorted(usage.items(), key=lambda item: item[1].size, reverse=True)
+            return {
+                "total_bytes": sum(entry.size for entry in usage.values()),
+                "budget": self.budget,
+                "largest_keys": [
+                    {
+                        "key": key,
+                        "bytes": entry.size,
+                        "growth": entry.size - entry.first_size,
+                        "writes": entry.writes,
+                        "pinned": self.is_pinned(key),
+                    }
+                    for key, entry in largest[:top]
+                ],
+                "evicted": list(self._evicted.get(session_id, [])),
+            }
+
+
+class StateWriteFilter:
+    """
+    Drops the state writes of a tool call that leave a value unchanged.
+
+    A tool's writes, memorize and the output_key of an AgentTool alike, end up
+    in the state delta of the tool's function response event, which the session
+    appends to its event log. The filter snapshots the session state before the
+    call and, after it, removes the keys whose new value has the same content as
+    before, so unchanged values, like an itinerary re-emitted as is, are neither
+    logged nor persisted again.
+
+    Register both callbacks on the agents owning the tools:
+
+        Agent(..., before_tool_callback=state_write_filter.before_tool,
+              after_tool_callback=state_write_filter.after_tool)
+
+    Given a StateBudget, the filter also hands it the sizes of the writes kept.
+
+    Several writes to one key within a tool call already share one delta entry;
+    the last one wins. A key set back to the very dict or list it held is kept,
+    as the tool may have edited that object in place.
+    """
+
+    def __init__(
+        self, budget: Optional[StateBudget] = None, max_pending_calls: int = MAX_PENDING_CALLS
+    ):
+        self.budget = budget
+        self.max_pending_calls = max_pending_calls
+        self._listeners: List[Callable[[ToolContext, Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        self._snapshots: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+
+        self.writes = 0
+        self.suppressed = 0
+        self.bytes_written = 0
+        self.bytes_saved = 0
+
+    def before_tool(
+        self, tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext
+    ) -> Optional[Dict]:
+        """before_tool_callback: records the values the tool may overwrite."""
+        # Only references are copied: tools replace state values rather than edit them.
+        snapshot = dict(tool_context._invocation_context.session.state)
+        with self._lock:
+            self._snapshots[tool_context.function_call_id] = snapshot
+            while len(self._snapshots) > self.max_pending_calls:
+                self._snapshots.popitem(last=False)
+        return None
+
+    def after_tool(
+        self,
+        tool: BaseTool,
+        args: Dict[str, Any],
+        tool_context: ToolContext,
+        tool_response: Dict,
+    ) -> Optional[Dict]:
+        """after_tool_callback: removes the unchanged values from the call's state delta."""
+        with self._lock:
+            snapshot = self._snapshots.pop(tool_context.function_call_id, None)
+        delta = tool_context.actions.state_delta
+        if snapshot is None or not delta:
+            return None
+
+        writes = suppressed = bytes_written = bytes_saved = 0
+        sizes = {}
+        for key in list(delta):
+            payload = serialize(delta[key])
+            writes += 1
+            before = snapshot.get(key, _MISSING)
+            edited_in_place = before is delta[key] and isinstance(before, (dict, list))
+            unchanged = (
+                before is not _MISSING and not edited_in_place and serialize(before) == payload
+            )
+            if unchanged:
+                del delta[key]
+                suppressed += 1
+                bytes_saved += len(payload)
+            else:
+                bytes_written += len(payload)
+                sizes[key] = len(payload)
+
+        with self._lock:
+            self.writes += writes
+            self.suppressed += suppressed
+            self.bytes_written += bytes_written
+            self.bytes_saved += bytes_saved
+        if self.budget is not None and sizes:
+            self.budget.account(tool_context, sizes)
+        if sizes:
+            changes = {key: delta[key] for key in sizes}
+            for listener in self._listeners:
+                listener(tool_context, changes)
+        return None
+
+    def add_listener(self, listener: Callable[[ToolContext, Dict[str, Any]], None]):
+        """
+        Registers a function called with the changes each tool call makes to the state.
+
+        Args:
+            listener: Called as listener(tool_context, changes), changes holding
+                the new value of every key whose content changed.
+        """
+        self._listeners.append(listener)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns how many writes were dropped and the bytes they would have added."""
+        with self._lock:
+            return {
+                "writes": self.writes,
+                "suppressed": self.suppressed,
+                "bytes_written": self.bytes_written,
+                "bytes_saved": self.bytes_saved,
+            }
+
+
+state_budget = StateBudget()
+state_write_filter = StateWriteFilter(budget=state_budget)
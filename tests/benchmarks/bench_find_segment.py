@@ -0,0 +1,97 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+How find_segment's next-event lookup scales with the number of itinerary events.
+
+Compares a linear scan of the itinerary with the timeline index, both when the
+index is built for the call and when it comes from the cache:
+
+    python -m tests.benchmarks.bench_find_segment --sizes 10 100 1000 10000
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import random
+import timeit
+
+from nomad_ai.sub_agents.in_trip.timeline import Timeline, event_datetime, get_timeline
+
+
+def make_itinerary(events: int, events_per_day: int = 6):
+    """A trip of `events` visits, `events_per_day` a day from 08:00."""
+    start = datetime(2025, 6, 15)
+    days = []
+    for n in range(0, events, events_per_day):
+        date = start + timedelta(days=n // events_per_day)
+        days.append(
+            {
+                "date": date.strftime("%Y-%m-%d"),
+                "events": [
+                    {
+                        "event_type": "visit",
+                        "description": f"Visit {n + i}",
+                        "start_time": f"{8 + 2 * i:02d}:00",
+                        "end_time": f"{9 + 2 * i:02d}:00",
+                    }
+                    for i in range(min(events_per_day, events - n))
+                ],
+            }
+        )
+    return {"trip_name": "Benchmark", "days": days}
+
+
+def linear_segment(itinerary, home, current: datetime):
+    """The next event lookup as a walk over every day and event."""
+    origin, destin = home, home
+    for day in itinerary.get("days", []):
+        for event in day["events"]:
+            origin, destin = destin, event
+            if event_datetime(day["date"], event) >= current:
+                return origin, destin
+    return origin, destin
+
+
+def main():
+    parser = argparse.ArgumentParser(description="find_segment lookup benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--lookups", type=int, default=200, help="Lookups per measurement")
+    args = parser.parse_args()
+
+    home = {"event_type": "home", "address": "Home", "local_prefer_mode": "drive"}
+    print(f"{'events':>7} {'linear us':>10} {'build us':>10} {'cached us':>10} {'bisect us':>10}")
+    for size in args.sizes:
+        itinerary = make_itinerary(size)
+        first = datetime(2025, 6, 15)
+        span = (size // 6 + 1) * 24 * 3600
+        times = [first + timedelta(seconds=random.randrange(span)) for _ in range(args.lookups)]
+
+        def per_lookup(fn):
+            return timeit.timeit(lambda: [fn(t) for t in times], number=1) / len(times) * 1e6
+
+        timeline = get_timeline(itinerary)
+        for t in times:  # The index answers like the scan does.
+            assert timeline.segment(home, t) == linear_segment(itinerary, home, t)
+
+        print(
+            f"{size:>7} "
+            f"{per_lookup(lambda t: linear_segment(itinerary, home, t)):>10.1f} "
+            f"{per_lookup(lambda t: Timeline(itinerary).segment(home, t)):>10.1f} "
+            f"{per_lookup(lambda t: get_timeline(itinerary).segment(home, t)):>10.1f} "
+            f"{per_lookup(lambda t: timeline.segment(home, t)):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Latency and throughput benchmark of map_tool against the local Places stand-in.
+
+Runs without network access or an API key:
+
+    python -m tests.benchmarks.bench_map_tool --latency 0.05 --batch-sizes 1 5 10 --concurrency 1 8 32
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from types import SimpleNamespace
+from typing import List
+
+from tests.places_standin import PlacesStandIn
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_scenario(map_tool, batch_size: int, concurrency: int, calls: int, repeat_pois: bool):
+    """Runs `calls` map_tool invocations, `concurrency` of them at a time."""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    run_id = time.monotonic_ns()
+
+    async def one_call(call: int):
+        # Unique POI names defeat the cache and single-flight unless repeat_pois is set.
+        prefix = "poi" if repeat_pois else f"poi-{run_id}-{call}"
+        tool_context = SimpleNamespace(
+            state={
+                "poi": {
+                    "places": [
+                        {"place_name": f"{prefix}-{i}", "address": "Seattle, WA"}
+                        for i in range(batch_size)
+                    ]
+                }
+            }
+        )
+        async with semaphore:
+            started = time.perf_counter()
+            await map_tool(key="poi", tool_context=tool_context)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_call(call) for call in range(calls)))
+    elapsed = time.perf_counter() - started
+    return latencies, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="map_tool benchmark")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stand-in latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Stand-in latency jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--calls", type=int, default=64, help="map_tool calls per scenario")
+    parser.add_argument("--cache", action="store_true", help="Keep the geocode cache enabled")
+    parser.add_argument("--repeat-pois", action="store_true", help="Reuse POI names across calls")
+    args = parser.parse_args()
+
+    with PlacesStandIn(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate) as standin:
+        # The services read their configuration when the module is imported.
+        os.environ["GOOGLE_PLACES_API_BASE_URL"] = standin.base_url
+        os.environ.setdefault("GOOGLE_PLACES_API_KEY", "standin")
+        os.environ.setdefault("PLACES_QPS", "100000")
+        os.environ.setdefault("PLACES_BURST", "100000")
+        if not args.cache:
+            os.environ["PLACES_CACHE_PATH"] = ""
+        from nomad_ai.tools.places import map_tool  # pylint: disable=import-outside-toplevel
+
+        print(
+            f"{'batch':>5} {'conc':>5} {'calls/s':>9} {'POIs/s':>9} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        for batch_size in args.batch_sizes:
+            for concurrency in args.concurrency:
+                latencies, elapsed = asyncio.run(
+                    run_scenario(map_tool, batch_size, concurrency, args.calls, args.repeat_pois)
+                )
+                print(
+                    f"{batch_size:>5} {concurrency:>5} "
+                    f"{args.calls / elapsed:>9.1f} {args.calls * batch_size / elapsed:>9.1f} "
+                    f"{statistics.median(latencies) * 1000:>8.1f} "
+                    f"{percentile(latencies, 95) * 1000:>8.1f} "
+                    f"{percentile(latencies, 99) * 1000:>8.1f}"
+                )
+        print(f"Stand-in served {standin.requests} requests.")
+
+
+if __name__ == "__main__":
+    main()
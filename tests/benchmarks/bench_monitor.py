@@ -0,0 +1,114 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+How the trip monitor's check extraction scales with the number of itinerary events.
+
+Times extract_checks and due_checks, and compares the size of the itinerary
+JSON the monitor model used to read with that of the findings table it now
+reads instead:
+
+    python -m tests.benchmarks.bench_monitor --sizes 10 100 1000 10000
+"""
+
+import argparse
+from datetime import datetime, timedelta
+import json
+import timeit
+
+from nomad_ai.sub_agents.in_trip.monitor import due_checks, extract_checks, findings_table
+
+# (description, name, booking_required, outdoor)
+VISITS = [
+    ("Visit Pike Place Market", "Pike Place Market", False, True),
+    ("Lunch at Ivar's Acres of Clams", "Ivar's Acres of Clams", False, False),
+    ("Visit the Space Needle", "Space Needle", True, True),
+    ("Visit the Museum of Pop Culture", "MoPOP", False, False),
+    ("Walk along the waterfront", "Seattle Waterfront", False, True),
+]
+
+
+def make_itinerary(events: int, events_per_day: int = 6):
+    """A trip with a flight on its first and last day, a hotel each day, and visits."""
+    start = datetime(2025, 6, 15)
+    days = []
+    for n in range(0, events, events_per_day):
+        date = (start + timedelta(days=n // events_per_day)).strftime("%Y-%m-%d")
+        day_events = [
+            {
+                "event_type": "hotel",
+                "description": "Hotel",
+                "address": "1 Hotel St, Seattle",
+                "check_in_time": "16:00",
+                "check_out_time": "11:00",
+                "booking_required": True,
+            }
+        ]
+        for i in range(min(events_per_day, events - n) - 1):
+            description, name, booking_required, outdoor = VISITS[(n + i) % len(VISITS)]
+            day_events.append(
+                {
+                    "event_type": "visit",
+                    "description": description,
+                    "location": {"name": name, "address": f"{name}, Seattle, WA"},
+                    "start_time": f"{8 + 2 * i:02d}:00",
+                    "end_time": f"{9 + 2 * i:02d}:00",
+                    "booking_required": booking_required,
+                    "outdoor": outdoor,
+                }
+            )
+        days.append({"date": date, "events": day_events})
+    days[0]["events"].insert(
+        0,
+        {
+            "event_type": "flight",
+            "flight_number": "AA1234",
+            "boarding_time": "07:30",
+            "departure_time": "08:00",
+            "booking_required": True,
+        },
+    )
+    return {"trip_name": "Benchmark", "start_date": days[0]["date"], "days": days}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trip monitor extraction benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--runs", type=int, default=20, help="Runs per measurement")
+    args = parser.parse_args()
+
+    now = datetime(2025, 6, 15, 12, 0)
+    print(
+        f"{'events':>7} {'checks':>7} {'due':>5} {'extract ms':>11} {'due ms':>8}"
+        f" {'itinerary chars':>16} {'findings chars':>15}"
+    )
+    for size in args.sizes:
+        itinerary = make_itinerary(size)
+        items = extract_checks(itinerary)
+        due, _ = due_checks(items, now)
+        table = findings_table(due, [{"status": f"{item.name} checked"} for item in due])
+
+        def per_run(fn):
+            return timeit.timeit(fn, number=args.runs) / args.runs * 1e3
+
+        print(
+            f"{size:>7} {len(items):>7} {len(due):>5}"
+            f" {per_run(lambda: extract_checks(itinerary)):>11.2f}"
+            f" {per_run(lambda: due_checks(items, now)):>8.2f}"
+            f" {len(json.dumps(itinerary)):>16} {len(table):>15}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A local stand-in for the Places API Find Place endpoint.
+
+Point PlacesService at it with base_url=standin.base_url, or export
+GOOGLE_PLACES_API_BASE_URL before nomad_ai.tools.places is imported.
+It can also run on its own:
+
+    python tests/places_standin.py --port 8765 --latency 0.05 --error-rate 0.01
+"""
+
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import hashlib
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+FIND_PLACE_PATH = "/maps/api/place/findplacefromtext/json"
+
+# Fixtures keyed by the lower-cased "place_name, address" query that map_tool sends.
+DEFAULT_FIXTURES = {
+    "machu picchu, machu picchu, peru": {
+        "place_id": "ChIJVVVViV-abZERJxqgpA43EDo",
+        "name": "Machu Picchu",
+        "formatted_address": "Machu Picchu, Peru",
+        "geometry": {"location": {"lat": -13.1631412, "lng": -72.5449629}},
+        "photos": [],
+    },
+}
+
+
+def synthesized_candidate(query: str) -> Dict[str, Any]:
+    """A deterministic made-up candidate for queries without a fixture."""
+    digest = hashlib.sha1(query.encode()).hexdigest()
+    return {
+        "place_id": "standin-" + digest[:20],
+        "name": query.split(",")[0],
+        "formatted_address": query,
+        "geometry": {
+            "location": {
+                "lat": int(digest[:6], 16) / 0xFFFFFF * 180 - 90,
+                "lng": int(digest[6:12], 16) / 0xFFFFFF * 360 - 180,
+            }
+        },
+        "photos": [],
+    }
+
+
+class PlacesStandIn:
+    """
+    A threaded HTTP server answering Find Place requests from fixtures.
+
+    Args:
+        fixtures: Candidates keyed by lower-cased query. Defaults to DEFAULT_FIXTURES.
+        latency: Seconds added to every response.
+        jitter: Extra uniformly random seconds added to every response.
+        error_rate: Fraction of requests answered with HTTP 503.
+        synthesize: Whether unknown queries get a synthesized candidate
+            instead of a ZERO_RESULTS answer.
+        port: Port to listen on; 0 picks a free one.
+    """
+
+    def __init__(
+        self,
+        fixtures: Optional[Dict[str, Dict[str, Any]]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        synthesize: bool = True,
+        port: int = 0,
+    ):
+        self.fixtures = dict(DEFAULT_FIXTURES if fixtures is None else fixtures)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.synthesize = synthesize
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real endpoint.
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != FIND_PLACE_PATH:
+                    self._reply(404, {"status": "NOT_FOUND"})
+                    return
+                query = parse_qs(url.query).get("input", [""])[0]
+                status, body = standin.answer(query)
+                self._reply(status, body)
+
+            def _reply(self, status: int, body: Dict[str, Any]):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                pass
+
+        return Handler
+
+    def answer(self, query: str):
+        """Returns the (status, body) the stand-in answers a query with."""
+        with self._lock:
+            self.requests += 1
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+        if random.random() < self.error_rate:
+            return 503, {"status": "UNKNOWN_ERROR"}
+
+        candidate = self.fixtures.get(query.lower())
+        if candidate is None and self.synthesize:
+            candidate = synthesized_candidate(query)
+        if candidate is None:
+            return 200, {"candidates": [], "status": "ZERO_RESULTS"}
+        return 200, {"candidates": [candidate], "status": "OK"}
+
+    def start(self) -> "PlacesStandIn":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "PlacesStandIn":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fixtures", help="JSON file of candidates keyed by query")
+    args = parser.parse_args()
+
+    fixtures = None
+    if args.fixtures:
+        with open(args.fixtures, "r") as file:
+            fixtures = {key.lower(): value for key, value in json.load(file).items()}
+
+    standin = PlacesStandIn(
+        fixtures=fixtures,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        port=args.port,
+    )
+    print(f"Places stand-in listening on {standin.base_url}")
+    standin.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the offline gazetteer index."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from nomad_ai.tools.gazetteer import Gazetteer, build_index
+
+PLACES = [
+    {
+        "name": "Machu Picchu",
+        "aliases": ["Machupicchu", "Lost City of the Incas"],
+        "place_id": "ChIJVVVViV-abZERJxqgpA43EDo",
+        "lat": -13.1631412,
+        "lng": -72.5449629,
+        "address": "Machu Picchu, Peru",
+    },
+    {
+        "name": "Central Park",
+        "place_id": "central-park-nyc",
+        "lat": 40.78,
+        "lng": -73.96,
+        "address": "New York, NY, USA",
+    },
+    {
+        "name": "Central Park",
+        "place_id": "central-park-sydney",
+        "lat": -33.88,
+        "lng": 151.20,
+        "address": "Chippendale NSW, Australia",
+    },
+]
+
+
+class TestGazetteer(unittest.TestCase):
+    """Test cases for building and querying a gazetteer index."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        source = os.path.join(self.tmpdir.name, "places.json")
+        with open(source, "w") as file:
+            json.dump(PLACES, file)
+        self.index = os.path.join(self.tmpdir.name, "gazetteer.sqlite3")
+        self.assertEqual(build_index(source, self.index), 3)
+        self.gazetteer = Gazetteer(self.index)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        super().tearDown()
+
+    def test_exact_and_fuzzy_names(self):
+        self.assertEqual(
+            self.gazetteer.lookup("Machu Picchu, Machu Picchu, Peru")["place_id"],
+            "ChIJVVVViV-abZERJxqgpA43EDo",
+        )
+        self.assertEqual(
+            self.gazetteer.lookup("machu-pichu")["place_id"], "ChIJVVVViV-abZERJxqgpA43EDo"
+        )
+        self.assertEqual(
+            self.gazetteer.lookup("Lost City of the Incas")["place_id"],
+            "ChIJVVVViV-abZERJxqgpA43EDo",
+        )
+
+    def test_address_breaks_ties(self):
+        self.assertEqual(
+            self.gazetteer.lookup("Central Park, New York")["place_id"], "central-park-nyc"
+        )
+        self.assertEqual(
+            self.gazetteer.lookup("Central Park, Sydney NSW Australia")["place_id"],
+            "central-park-sydney",
+        )
+
+    def test_misses_below_threshold(self):
+        self.assertIsNone(self.gazetteer.lookup("Space Needle, Seattle"))
+        self.assertIsNone(self.gazetteer.lookup("Central Park, Paris, France"))
+        self.assertEqual(self.gazetteer.stats()["misses"], 2)
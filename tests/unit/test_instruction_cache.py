@@ -0,0 +1,94 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the cache of day_of instructions."""
+
+import copy
+import json
+from types import SimpleNamespace
+import unittest
+from unittest import mock
+
+from nomad_ai.shared_libraries import constants
+from nomad_ai.sub_agents.in_trip import tools
+from nomad_ai.sub_agents.in_trip.tools import InstructionCache, transit_coordination
+
+with open("nomad_ai/profiles/itinerary_seattle_example.json", "r") as file:
+    SCENARIO = json.load(file)["state"]
+
+
+def readonly_context(state):
+    return SimpleNamespace(state=state)
+
+
+class TestInstructionCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = InstructionCache(max_entries=4)
+        self.itinerary = copy.deepcopy(SCENARIO["itinerary"])
+        self.profile = copy.deepcopy(SCENARIO["user_profile"])
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return f"instruction {self.builds}"
+
+    def get(self, current_datetime="2025-06-15 09:00"):
+        return self.cache.get(self.itinerary, self.profile, current_datetime, self.build)
+
+    def test_repeated_calls_hit(self):
+        self.assertEqual(self.get(), "instruction 1")
+        self.assertEqual(self.get(), "instruction 1")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_keyed_by_datetime(self):
+        self.get("2025-06-15 09:00")
+        self.assertEqual(self.get("2025-06-15 12:00"), "instruction 2")
+        self.assertEqual(self.get("2025-06-15 09:00"), "instruction 1")
+
+    def test_equal_content_shares_instructions(self):
+        self.get()
+        self.itinerary = copy.deepcopy(self.itinerary)
+        self.assertEqual(self.get(), "instruction 1")
+
+    def test_edit_in_place_builds_again(self):
+        self.get()
+        self.itinerary["days"][0]["events"][0]["boarding_time"] = "06:30"
+        self.assertEqual(self.get(), "instruction 2")
+
+    def test_bounded(self):
+        for hour in range(10, 20):
+            self.get(f"2025-06-15 {hour}:00")
+        self.assertEqual(self.cache.stats()["entries"], 4)
+
+
+class TestTransitCoordination(unittest.TestCase):
+    def test_cached_instruction_matches_a_rebuild(self):
+        state = copy.deepcopy(SCENARIO)
+        state[constants.ITIN_DATETIME] = "2025-06-15 06:00"
+        context = readonly_context(state)
+        first = transit_coordination(context)
+        with mock.patch.object(tools, "find_segment") as find_segment:
+            self.assertEqual(transit_coordination(context), first)
+        find_segment.assert_not_called()
+        self.assertIn("2025-06-15 06:00", first)
+
+    def test_needs_an_itinerary(self):
+        state = {constants.LEGACY_PROF_KEY: SCENARIO["user_profile"]}
+        self.assertEqual(
+            transit_coordination(readonly_context(state)), tools.prompt.NEED_ITIN_INSTR
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
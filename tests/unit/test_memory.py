@@ -0,0 +1,245 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the session state memory helpers."""
+
+import asyncio
+import copy
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools import FunctionTool
+from google.adk.utils.instructions_utils import inject_session_state
+from nomad_ai.agent import root_agent
+from nomad_ai.prompt import ROOT_AGENT_INSTR
+from nomad_ai.shared_libraries import constants
+from nomad_ai.shared_libraries.types import MemoryItem
+from nomad_ai.tools import memory
+
+SCENARIO = {
+    "state": {
+        constants.LEGACY_PROF_KEY: {"passport_nationality": "US Citizen"},
+        constants.ITIN_KEY: {
+            "start_date": "2025-06-15",
+            "end_date": "2025-06-17",
+            "days": [],
+        },
+    }
+}
+
+
+class TestScenarioLoading(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "scenario.json")
+        self._write(SCENARIO)
+        memory._scenario_templates.clear()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _write(self, scenario, mtime_ns=None):
+        with open(self.path, "w") as file:
+            json.dump(scenario, file)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_scenario_is_parsed_once(self):
+        with mock.patch.object(memory.json, "load", wraps=json.load) as load:
+            first = memory._load_scenario(self.path)
+            second = memory._load_scenario(self.path)
+        self.assertIs(first, second)
+        self.assertEqual(load.call_count, 1)
+        with self.assertRaises(TypeError):
+            first["user_profile"] = {}
+
+    def test_scenario_is_reread_when_modified(self):
+        first = memory._load_scenario(self.path)
+        changed = {"state": {constants.LEGACY_PROF_KEY: {"passport_nationality": "Canadian"}}}
+        self._write(changed, mtime_ns=os.stat(self.path).st_mtime_ns + 10**9)
+        second = memory._load_scenario(self.path)
+        self.assertIsNot(first, second)
+        self.assertEqual(second[constants.LEGACY_PROF_KEY]["passport_nationality"], "Canadian")
+
+    def test_sessions_share_the_template_until_they_write(self):
+        first, second = {}, {}
+        memory._set_initial_states(memory._load_scenario(self.path), first)
+        memory._set_initial_states(memory._load_scenario(self.path), second)
+        self.assertIs(first[constants.PROF_KEY], second[constants.PROF_KEY])
+        self.assertIs(copy.deepcopy(first)[constants.ITIN_KEY], second[constants.ITIN_KEY])
+        self.assertEqual(first[constants.ITIN_START_DATE], "2025-06-15")
+
+        with self.assertRaises(TypeError):
+            first[constants.PROF_KEY]["passport_nationality"] = "Canadian"
+        memory.writable(first, constants.PROF_KEY)["passport_nationality"] = "Canadian"
+
+        self.assertIs(type(first[constants.PROF_KEY]), dict)
+        self.assertEqual(second[constants.PROF_KEY]["passport_nationality"], "US Citizen")
+        self.assertEqual(
+            memory._load_scenario(self.path)[constants.LEGACY_PROF_KEY]["passport_nationality"],
+            "US Citizen",
+        )
+
+    def test_profile_is_user_scoped(self):
+        state = {constants.PROF_KEY: {"passport_nationality": "Canadian"}}
+        memory._set_initial_states(memory._load_scenario(self.path), state)
+        self.assertNotIn(constants.LEGACY_PROF_KEY, state)
+        self.assertEqual(memory.get_user_profile(state), {"passport_nationality": "Canadian"})
+        self.assertEqual(
+            memory.get_user_profile({constants.LEGACY_PROF_KEY: {"passport_nationality": "US"}}),
+            {"passport_nationality": "US"},
+        )
+
+    def test_shared_values_serialize_as_plain_json(self):
+        state = {}
+        memory._set_initial_states(memory._load_scenario(self.path), state)
+        self.assertEqual(
+            json.loads(json.dumps(state))[constants.ITIN_KEY], SCENARIO["state"][constants.ITIN_KEY]
+        )
+        self.assertIs(type(pickle.loads(pickle.dumps(state[constants.ITIN_KEY]))["days"]), list)
+
+    def test_memorize_list_copies_on_write(self):
+        state = {"interests": memory._freeze(["museums"])}
+        tool_context = SimpleNamespace(state=state)
+        memory.memorize_list("interests", "museums", tool_context)
+        self.assertIsInstance(state["interests"], memory.SharedList)
+        memory.memorize_list("interests", "hiking", tool_context)
+        self.assertEqual(state["interests"], ["museums", "hiking"])
+        self.assertNotIsInstance(state["interests"], memory.SharedList)
+
+    def test_initialized_session_skips_loading(self):
+        state = {}
+        callback_context = SimpleNamespace(
+            state=state,
+            _invocation_context=SimpleNamespace(
+                session=SimpleNamespace(id="s", user_id="u")
+            ),
+        )
+        with mock.patch.object(memory, "SAMPLE_SCENARIO_PATH", self.path):
+            memory._load_precreated_itinerary(callback_context)
+            self.assertIn(constants.ITIN_KEY, state)
+            with mock.patch.object(memory, "_load_scenario") as load:
+                memory._load_precreated_itinerary(callback_context)
+        load.assert_not_called()
+
+    def test_legacy_session_profile_is_migrated(self):
+        legacy_state = dict(copy.deepcopy(SCENARIO["state"]))
+        legacy_state[constants.SYSTEM_TIME] = "2025-06-01 09:00:00"
+        legacy_state[constants.ITIN_INITIALIZED] = True
+        legacy_state[constants.ITIN_START_DATE] = "2025-06-15"
+        legacy_state[constants.ITIN_END_DATE] = "2025-06-17"
+        legacy_state[constants.ITIN_DATETIME] = "2025-06-15"
+        session_service = InMemorySessionService()
+        session = session_service.create_session_sync(
+            app_name="nomad_ai", user_id="legacy_user", state=legacy_state
+        )
+        invocation_context = InvocationContext(
+            session_service=session_service,
+            invocation_id="legacy",
+            agent=root_agent,
+            session=session,
+        )
+        callback_context = SimpleNamespace(
+            state=session.state, _invocation_context=invocation_context
+        )
+
+        memory._load_precreated_itinerary(callback_context)
+        instruction = asyncio.run(
+            inject_session_state(ROOT_AGENT_INSTR, ReadonlyContext(invocation_context))
+        )
+        self.assertEqual(session.state[constants.PROF_KEY], SCENARIO["state"][constants.LEGACY_PROF_KEY])
+        self.assertIn("US Citizen", instruction)
+
+
+class TestMemorizeMany(unittest.TestCase):
+    def test_stores_every_key_in_one_update(self):
+        state = mock.MagicMock()
+        result = memory.memorize_many(
+            [
+                {"key": "outbound_flight_selection", "value": "AA31"},
+                MemoryItem(key="outbound_seat_number", value="2A"),
+            ],
+            SimpleNamespace(state=state),
+        )
+        state.update.assert_called_once_with(
+            {"outbound_flight_selection": "AA31", "outbound_seat_number": "2A"}
+        )
+        self.assertIn("outbound_seat_number", result["status"])
+
+    def test_invalid_keys_store_nothing(self):
+        state = {}
+        memory.memorize_many(
+            [{"key": "origin", "value": "SEA"}, {"key": "", "value": "LAX"}],
+            SimpleNamespace(state=state),
+        )
+        self.assertEqual(state, {})
+
+    def test_values_other_than_text_store_nothing(self):
+        state = {}
+        result = memory.memorize_many(
+            [
+                {"key": "origin", "value": "SEA"},
+                {"key": "outbound_flight_selection", "value": {"flight_number": "AA31"}},
+                {"key": "outbound_seat_number", "value": 2},
+            ],
+            SimpleNamespace(state=state),
+        )
+        self.assertEqual(state, {})
+        self.assertIn("must be text", result["status"])
+        self.assertNotIn("'origin'", result["status"])
+
+    def test_declares_the_item_fields(self):
+        declaration = FunctionTool(memory.memorize_many)._get_declaration()
+        items = declaration.parameters.properties["items"]
+        self.assertEqual(set(items.items.properties), {"key", "value"})
+
+
+class TestListMemory(unittest.TestCase):
+    def test_ordered_set_operations(self):
+        values = memory.ListMemory(["museums", "hiking", "museums", {"cuisine": "thai"}])
+        self.assertEqual(values.to_list(), ["museums", "hiking", {"cuisine": "thai"}])
+        self.assertIn({"cuisine": "thai"}, values)
+        self.assertEqual(values.add_all(["hiking", "wine"]), 1)
+        self.assertEqual(values.discard_all(["museums", "opera"]), 1)
+        self.assertEqual(values.to_list(), ["hiking", {"cuisine": "thai"}, "wine"])
+
+    def test_max_len_drops_oldest(self):
+        values = memory.ListMemory(["a", "b"], max_len=3)
+        values.add_all(["c", "d", "b"])
+        self.assertEqual(values.to_list(), ["b", "c", "d"])
+
+    def test_memorize_list_and_forget(self):
+        tool_context = SimpleNamespace(state={})
+        memory.memorize_list("interests", "museums", tool_context)
+        memory.memorize_list("interests", "museums", tool_context)
+        memory.memorize_list("interests", "hiking", tool_context)
+        self.assertEqual(tool_context.state["interests"], ["museums", "hiking"])
+
+        memory.forget("interests", "museums", tool_context)
+        self.assertEqual(tool_context.state["interests"], ["hiking"])
+        result = memory.forget("allergies", "peanuts", tool_context)
+        self.assertIn("Nothing to remove", result["status"])
+        self.assertNotIn("allergies", tool_context.state)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the trip monitor's check extraction and findings."""
+
+import asyncio
+import copy
+from datetime import datetime
+import json
+from types import SimpleNamespace
+import unittest
+
+from nomad_ai.shared_libraries import constants
+from nomad_ai.shared_libraries.types import AttractionEvent
+from nomad_ai.sub_agents.in_trip.monitor import (
+    BOOKING,
+    FLIGHT,
+    WEATHER,
+    due_checks,
+    extract_checks,
+    is_outdoor,
+)
+from nomad_ai.sub_agents.in_trip.tools import monitor_trip
+
+with open("nomad_ai/profiles/itinerary_seattle_example.json", "r") as file:
+    SCENARIO = json.load(file)["state"]
+ITINERARY = SCENARIO["itinerary"]
+
+
+class TestExtractChecks(unittest.TestCase):
+    def setUp(self):
+        self.items = extract_checks(ITINERARY)
+
+    def test_classifies_events(self):
+        kinds = [(item.kind, item.name) for item in self.items]
+        self.assertEqual(kinds[0], (FLIGHT, "AA1234"))
+        self.assertIn((BOOKING, "Space Needle"), kinds)
+        self.assertIn((WEATHER, "Space Needle"), kinds)
+        self.assertIn((WEATHER, "Pike Place Market"), kinds)
+        self.assertNotIn((WEATHER, "Capitol Hill Neighborhood"), kinds)  # Dinner.
+
+    def test_flight_arguments(self):
+        self.assertEqual(
+            self.items[0].args,
+            {
+                "flight_number": "AA1234",
+                "flight_date": "2025-06-15",
+                "checkin_time": "07:30",
+                "departure_time": "08:00",
+            },
+        )
+
+    def test_outdoor_flag_overrides_words(self):
+        self.assertFalse(is_outdoor({"description": "Park walk", "outdoor": False}))
+        self.assertTrue(is_outdoor({"description": "Museum visit", "outdoor": True}))
+        self.assertFalse(is_outdoor({"description": "Museum of the Park"}))
+
+    def test_outdoor_field_is_in_the_itinerary_schema(self):
+        event = AttractionEvent(
+            description="Space Needle observation deck",
+            address="400 Broad St, Seattle",
+            start_time="14:30",
+            end_time="16:30",
+            outdoor=True,
+            price="",
+        )
+        self.assertTrue(is_outdoor(event.model_dump()))
+
+    def test_check_windows(self):
+        flight = self.items[0]
+        due, upcoming = due_checks([flight], datetime(2025, 6, 13, 8, 0))
+        self.assertEqual((due, upcoming), ([flight], []))
+        due, upcoming = due_checks([flight], datetime(2025, 6, 13, 7, 0))
+        self.assertEqual((due, upcoming), ([], [flight]))
+        self.assertEqual(due_checks([flight], datetime(2025, 6, 15, 8, 0)), ([], []))
+
+
+class TestMonitorTrip(unittest.TestCase):
+    def run_monitor(self, state):
+        return asyncio.run(monitor_trip(SimpleNamespace(state=state)))
+
+    def test_findings_table(self):
+        state = copy.deepcopy(SCENARIO)
+        state[constants.ITIN_DATETIME] = "2025-06-15 12:00"
+        result = self.run_monitor(state)
+        lines = result["findings"].splitlines()
+        self.assertEqual(lines[0], "date | check | item | status")
+        self.assertIn("2025-06-16 | booking | Space Needle | Space Needle is closed.", lines)
+        self.assertNotIn("AA1234", result["findings"])  # Boarded already.
+        self.assertEqual(result["checked"], len(lines) - 1)
+
+    def test_no_itinerary(self):
+        self.assertIn("no itinerary", self.run_monitor({constants.ITIN_KEY: {}})["status"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,269 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Offline tests for PlacesService lookups."""
+
+import asyncio
+import os
+import tempfile
+import threading
+from types import SimpleNamespace
+import unittest
+
+import requests
+from requests.adapters import BaseAdapter
+
+from nomad_ai.tools.memory import SharedDict, _freeze
+from nomad_ai.tools.places import (
+    GEOCODE_FINGERPRINT,
+    AsyncPlacesService,
+    PlacesService,
+    map_tool,
+    poi_fingerprint,
+)
+from nomad_ai.tools.places_cache import GeocodeCache
+from nomad_ai.tools.places_transport import AsyncPlacesTransport, PlacesTransport
+from tests.places_standin import PlacesStandIn
+
+
+class CountingPlacesService(PlacesService):
+    """A PlacesService answering from a dict instead of the Places API."""
+
+    def __init__(self, answers, **kwargs):
+        super().__init__(**kwargs)
+        self.answers = answers
+        self.calls = []
+        self._calls_lock = threading.Lock()
+
+    def _fetch_place_from_text(self, query):
+        with self._calls_lock:
+            self.calls.append(query)
+        answer = self.answers[query]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+class CountingAsyncPlacesService(AsyncPlacesService):
+    """An AsyncPlacesService answering from a dict instead of the Places API."""
+
+    def __init__(self, answers, **kwargs):
+        super().__init__(**kwargs)
+        self.answers = answers
+        self.calls = []
+
+    async def _fetch_place_from_text(self, query):
+        self.calls.append(query)
+        await asyncio.sleep(0)
+        answer = self.answers[query]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+class ScriptedAdapter(BaseAdapter):
+    """Answers requests with a fixed sequence of status codes."""
+
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = list(statuses)
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0)
+        response.request = request
+        response._content = b'{"candidates": []}'
+        return response
+
+    def close(self):
+        pass
+
+
+class TestBatchLookup(unittest.TestCase):
+    """Test cases for PlacesService.find_places_from_text."""
+
+    def test_dedupes_and_keeps_order(self):
+        service = CountingPlacesService(
+            {"Space Needle, Seattle": {"place_id": "a"}, "Pike Place, Seattle": {"place_id": "b"}}
+        )
+        results = service.find_places_from_text(
+            ["Space Needle, Seattle", "Pike Place, Seattle", "space needle,  seattle"]
+        )
+        self.assertEqual([r["place_id"] for r in results], ["a", "b", "a"])
+        self.assertEqual(len(service.calls), 2)
+
+    def test_failures_do_not_fail_the_batch(self):
+        service = CountingPlacesService(
+            {"Space Needle, Seattle": {"place_id": "a"}, "Broken": ValueError("boom")}
+        )
+        results = service.find_places_from_text(["Broken", "Space Needle, Seattle"])
+        self.assertIn("error", results[0])
+        self.assertEqual(results[1]["place_id"], "a")
+
+    def test_async_batch(self):
+        service = CountingAsyncPlacesService(
+            {"Space Needle, Seattle": {"place_id": "a"}, "Broken": ValueError("boom")}
+        )
+        results = asyncio.run(
+            service.find_places_from_text(
+                ["Space Needle, Seattle", "Broken", "space needle, seattle"]
+            )
+        )
+        self.assertEqual(results[0], {"place_id": "a"})
+        self.assertIn("error", results[1])
+        self.assertEqual(results[2], {"place_id": "a"})
+        self.assertEqual(len(service.calls), 2)
+
+
+class TestTransport(unittest.TestCase):
+    """Test cases for the pooled PlacesTransport."""
+
+    def test_retries_transient_statuses(self):
+        transport = PlacesTransport(max_retries=3, backoff_base=0)
+        transport.session.mount("https://", ScriptedAdapter([503, 429, 200]))
+        response = transport.get("https://maps.googleapis.com/test", params={})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(transport.stats()["retries"], 2)
+
+    def test_gives_up_after_max_retries(self):
+        transport = PlacesTransport(max_retries=1, backoff_base=0)
+        transport.session.mount("https://", ScriptedAdapter([500, 500, 200]))
+        response = transport.get("https://maps.googleapis.com/test", params={})
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(transport.stats()["attempts"], 2)
+
+
+class TestAgainstStandIn(unittest.TestCase):
+    """Test cases running the services against the local Places stand-in."""
+
+    def setUp(self):
+        super().setUp()
+        self.standin = PlacesStandIn().start()
+
+    def tearDown(self):
+        self.standin.stop()
+        super().tearDown()
+
+    def test_sync_lookup(self):
+        service = PlacesService(base_url=self.standin.base_url)
+        result = service.find_place_from_text("Machu Picchu, Machu Picchu, Peru")
+        self.assertEqual(result["place_id"], "ChIJVVVViV-abZERJxqgpA43EDo")
+
+    def test_async_lookup_with_retries(self):
+        self.standin.error_rate = 0.5
+        service = AsyncPlacesService(
+            base_url=self.standin.base_url,
+            transport=AsyncPlacesTransport(max_retries=10, backoff_base=0),
+        )
+        results = asyncio.run(
+            service.find_places_from_text([f"poi-{i}, Seattle" for i in range(10)])
+        )
+        self.assertTrue(all("place_id" in result for result in results))
+
+    def test_no_places_found(self):
+        self.standin.synthesize = False
+        service = PlacesService(base_url=self.standin.base_url)
+        self.assertEqual(service.find_place_from_text("Nowhere"), {"error": "No places found."})
+
+
+class TestIncrementalMapTool(unittest.TestCase):
+    """Test cases for map_tool skipping POIs verified by an earlier call."""
+
+    def test_skips_verified_pois(self):
+        poi = {"place_name": "Machu Picchu", "address": "Machu Picchu, Peru"}
+        poi.update(place_id="ChIJVVVViV-abZERJxqgpA43EDo", lat="-13.16", long="-72.54")
+        poi[GEOCODE_FINGERPRINT] = poi_fingerprint(poi)
+        tool_context = SimpleNamespace(state={"poi": {"places": [poi, dict(poi)]}})
+
+        result = asyncio.run(map_tool(key="poi", tool_context=tool_context))
+        self.assertEqual(result["skipped"], 2)
+        self.assertEqual(result["places"][0]["place_id"], "ChIJVVVViV-abZERJxqgpA43EDo")
+
+    def test_verified_template_pois_stay_shared(self):
+        poi = {"place_name": "Machu Picchu", "address": "Machu Picchu, Peru"}
+        poi.update(place_id="ChIJVVVViV-abZERJxqgpA43EDo", lat="-13.16", long="-72.54")
+        poi[GEOCODE_FINGERPRINT] = poi_fingerprint(poi)
+        tool_context = SimpleNamespace(state={"poi": _freeze({"places": [poi]})})
+
+        asyncio.run(map_tool(key="poi", tool_context=tool_context))
+        self.assertIsInstance(tool_context.state["poi"], SharedDict)
+
+    def test_fingerprint_tracks_name_and_address(self):
+        poi = {"place_name": "Space Needle", "address": "Seattle"}
+        self.assertEqual(
+            poi_fingerprint(poi), poi_fingerprint({"place_name": "space needle ", "address": "SEATTLE"})
+        )
+        self.assertNotEqual(
+            poi_fingerprint(poi), poi_fingerprint({"place_name": "Space Needle", "address": "Las Vegas"})
+        )
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    """Test cases for serving stale cache entries while refreshing them."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = GeocodeCache(path=os.path.join(self.tmpdir.name, "places.sqlite3"), fresh_ttl=0)
+        self.cache.put("Space Needle, Seattle", {"place_id": "old"})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        super().tearDown()
+
+    def test_sync_refresh_in_background(self):
+        service = CountingPlacesService({"Space Needle, Seattle": {"place_id": "new"}}, cache=self.cache)
+        self.assertEqual(service.find_place_from_text("Space Needle, Seattle"), {"place_id": "old"})
+        service._revalidator.shutdown(wait=True)
+        self.assertEqual(service.calls, ["Space Needle, Seattle"])
+        self.assertEqual(self.cache.get("Space Needle, Seattle"), {"place_id": "new"})
+
+    def test_async_refresh_in_background(self):
+        service = CountingAsyncPlacesService(
+            {"Space Needle, Seattle": {"place_id": "new"}}, cache=self.cache
+        )
+
+        async def main():
+            result = await service.find_place_from_text("Space Needle, Seattle")
+            await asyncio.gather(*service._revalidation_tasks)
+            return result
+
+        self.assertEqual(asyncio.run(main()), {"place_id": "old"})
+        self.assertEqual(self.cache.get("Space Needle, Seattle"), {"place_id": "new"})
+        self.assertEqual(service.revalidation_stats()["revalidations"], 1)
+
+
+class TestPhotoUrls(unittest.TestCase):
+    """Test cases for keeping the API key out of cached photo URLs."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = GeocodeCache(path=os.path.join(self.tmpdir.name, "places.sqlite3"))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        super().tearDown()
+
+    def test_cache_holds_references_only(self):
+        answer = {"place_id": "a", "photo_references": ["ref-1"]}
+        service = CountingPlacesService({"Space Needle, Seattle": answer}, cache=self.cache)
+        service.places_api_key = "old-key"
+        self.assertIn("key=old-key", service.find_place_from_text("Space Needle, Seattle")["photos"][0])
+        self.assertEqual(self.cache.get("Space Needle, Seattle"), answer)
+
+        service.places_api_key = "new-key"
+        photos = service.find_place_from_text("Space Needle, Seattle")["photos"]
+        self.assertEqual(len(service.calls), 1)
+        self.assertTrue(photos[0].endswith("photoreference=ref-1&key=new-key"))
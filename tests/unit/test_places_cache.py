@@ -0,0 +1,79 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the on-disk geocode cache behind PlacesService."""
+
+import os
+import tempfile
+import time
+import unittest
+
+from nomad_ai.tools.places_cache import GeocodeCache, NO_PLACES_FOUND, normalize_query
+
+MACHU_PICCHU = {"place_id": "ChIJVVVViV-abZERJxqgpA43EDo", "lat": "-13.16", "lng": "-72.54"}
+
+
+class TestGeocodeCache(unittest.TestCase):
+    """Test cases for GeocodeCache."""
+
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "places.sqlite3")
+        self.cache = GeocodeCache(path=self.path, ttl=60, negative_ttl=60, max_entries=3)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        super().tearDown()
+
+    def test_normalized_keys(self):
+        self.assertEqual(
+            normalize_query("  Machu Picchu,Peru "), normalize_query("machu picchu , PERU")
+        )
+        self.cache.put("Machu Picchu, Peru", MACHU_PICCHU)
+        self.assertEqual(self.cache.get("machu  picchu ,peru"), MACHU_PICCHU)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_ttl_and_negative_results(self):
+        self.cache.put("Nowhere", {"error": NO_PLACES_FOUND})
+        self.cache.put("Machu Picchu, Peru", MACHU_PICCHU, ttl=0)
+        self.assertEqual(self.cache.get("Nowhere"), {"error": NO_PLACES_FOUND})
+        self.assertIsNone(self.cache.get("Machu Picchu, Peru"))
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_lru_eviction(self):
+        for name in ["a", "b", "c"]:
+            self.cache.put(name, MACHU_PICCHU)
+            time.sleep(0.01)
+        self.cache.get("a")
+        self.cache.put("d", MACHU_PICCHU)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertEqual(self.cache.stats()["entries"], 3)
+
+    def test_persistence(self):
+        self.cache.put("Machu Picchu, Peru", MACHU_PICCHU)
+        reopened = GeocodeCache(path=self.path)
+        self.assertEqual(reopened.get("Machu Picchu, Peru"), MACHU_PICCHU)
+
+    def test_stale_entries_are_served(self):
+        cache = GeocodeCache(path=self.path, ttl=60, fresh_ttl=0)
+        cache.put("Machu Picchu, Peru", MACHU_PICCHU)
+        entry = cache.get_entry("Machu Picchu, Peru")
+        self.assertEqual(entry.value, MACHU_PICCHU)
+        self.assertTrue(entry.is_stale)
+        self.assertLessEqual(entry.fetched_at, time.time())
+        self.assertEqual(cache.stats()["stale_hits"], 1)
+        self.cache.put("Machu Picchu, Peru", MACHU_PICCHU)
+        self.assertFalse(self.cache.get_entry("Machu Picchu, Peru").is_stale)
@@ -0,0 +1,133 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the read-through user profile store."""
+
+import time
+import unittest
+
+from nomad_ai.tools.profiles import ProfileRepository, SqliteProfileBackend
+
+
+class CountingBackend(SqliteProfileBackend):
+    """The SQLite stand-in, counting the calls of each kind."""
+
+    def __init__(self):
+        super().__init__(":memory:")
+        self.calls = {"load": 0, "version": 0, "save_many": 0}
+
+    def load(self, user_id):
+        self.calls["load"] += 1
+        return super().load(user_id)
+
+    def version(self, user_id):
+        self.calls["version"] += 1
+        return super().version(user_id)
+
+    def save_many(self, profiles):
+        self.calls["save_many"] += 1
+        return super().save_many(profiles)
+
+
+class FlakyBackend(CountingBackend):
+    """Fails the first save_many calls."""
+
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def save_many(self, profiles):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        return super().save_many(profiles)
+
+
+def wait_for(condition, timeout: float = 5.0):
+    """Waits for a write-back on the flush thread."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.01)
+
+
+class TestProfileRepository(unittest.TestCase):
+    def setUp(self):
+        self.backend = CountingBackend()
+        self.backend.save_many({"traveler0115": {"passport_nationality": "US Citizen"}})
+        self.backend.calls["save_many"] = 0
+
+    def test_reads_through_the_cache(self):
+        profiles = ProfileRepository(self.backend, ttl=60)
+        self.assertEqual(profiles.get("traveler0115"), {"passport_nationality": "US Citizen"})
+        self.assertEqual(profiles.get("traveler0115"), {"passport_nationality": "US Citizen"})
+        self.assertIsNone(profiles.get("nobody"))
+        self.assertIsNone(profiles.get("nobody"))
+        self.assertEqual(self.backend.calls["load"], 2)
+        self.assertEqual(profiles.stats()["hits"], 2)
+
+    def test_revalidates_by_version_after_ttl(self):
+        profiles = ProfileRepository(self.backend, ttl=0)
+        profiles.get("traveler0115")
+        profiles.get("traveler0115")
+        self.assertEqual(self.backend.calls, {"load": 1, "version": 1, "save_many": 0})
+
+        # Another process updates the profile.
+        other = ProfileRepository(self.backend)
+        other.put("traveler0115", {"passport_nationality": "Canadian"})
+        other.flush()
+        self.assertEqual(profiles.get("traveler0115"), {"passport_nationality": "Canadian"})
+        self.assertEqual(self.backend.calls["load"], 2)
+
+    def test_writes_back_in_batches(self):
+        profiles = ProfileRepository(self.backend, flush_batch=3, flush_delay=60)
+        profiles.put("a", {"seat": "aisle"})
+        profiles.put("b", {"seat": "window"})
+        self.assertEqual(profiles.get("a"), {"seat": "aisle"})
+        self.assertEqual(self.backend.calls["save_many"], 0)
+
+        profiles.put("c", {"seat": "window"})
+        wait_for(lambda: profiles.stats()["flushes"] == 1)
+        self.assertEqual(self.backend.calls["save_many"], 1)
+        self.assertEqual(self.backend.load("b").profile, {"seat": "window"})
+        self.assertEqual(profiles.stats()["written"], 3)
+
+    def test_lru_keeps_pending_updates(self):
+        profiles = ProfileRepository(self.backend, max_entries=1, flush_batch=10, flush_delay=60)
+        profiles.put("a", {"seat": "aisle"})
+        profiles.get("traveler0115")
+        self.assertEqual(profiles.get("a"), {"seat": "aisle"})
+        profiles.flush()
+
+    def test_pending_updates_beyond_max_entries(self):
+        profiles = ProfileRepository(self.backend, max_entries=1, flush_batch=10, flush_delay=60)
+        profiles.put("a", {"seat": "aisle"})
+        profiles.put("b", {"seat": "window"})
+        self.assertEqual((profiles.get("a"), profiles.get("b")), ({"seat": "aisle"}, {"seat": "window"}))
+        self.assertEqual(profiles.flush(), 2)
+        profiles.get("traveler0115")
+        self.assertEqual(profiles.stats()["entries"], 1)
+
+    def test_failed_write_back_is_retried(self):
+        backend = FlakyBackend(failures=2)
+        profiles = ProfileRepository(backend, flush_batch=1, flush_delay=0.05)
+        profiles.put("a", {"seat": "aisle"})  # The failure stays on the flush thread.
+        wait_for(lambda: profiles.stats()["written"] == 1)
+        self.assertEqual(backend.failures, 0)
+        self.assertEqual(backend.load("a").profile, {"seat": "aisle"})
+
+
+if __name__ == "__main__":
+    unittest.main()
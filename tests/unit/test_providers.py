@@ -0,0 +1,137 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the check providers."""
+
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from nomad_ai.sub_agents.in_trip.providers import (
+    CircuitBreaker,
+    CircuitOpenError,
+    FakeBookingProvider,
+    FakeProvider,
+    FakeWeatherProvider,
+    ResilientProvider,
+)
+
+ACTIVITY = {
+    "activity_name": "Pike Place Market",
+    "activity_date": "2025-06-16",
+    "activity_location": "Seattle",
+}
+
+
+class SlowFirstProvider:
+    """Answers its first call after `first_latency` seconds, and the others at once."""
+
+    def __init__(self, first_latency: float):
+        self.first_latency = first_latency
+        self.calls = 0
+        self.cancelled = 0
+
+    async def check(self, **args):
+        self.calls += 1
+        try:
+            if self.calls == 1:
+                await asyncio.sleep(self.first_latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return {"status": f"answer {self.calls}"}
+
+
+class TestResilientProvider(unittest.TestCase):
+    def test_fake_answers(self):
+        provider = ResilientProvider(FakeBookingProvider())
+        result = asyncio.run(
+            provider.check(event_name="Space Needle", event_date="2025-06-16", event_location="")
+        )
+        self.assertEqual(result, {"status": "Space Needle is closed."})
+
+    def test_hedged_call_wins_over_a_slow_one(self):
+        slow = SlowFirstProvider(first_latency=1.0)
+        provider = ResilientProvider(slow, deadline=2.0, hedge_after=0.05)
+        start = time.monotonic()
+        result = asyncio.run(provider.check(**ACTIVITY))
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(result, {"status": "answer 2"})
+        self.assertEqual((provider.hedged, provider.hedge_wins, slow.cancelled), (1, 1, 1))
+
+    def test_deadline(self):
+        provider = ResilientProvider(FakeWeatherProvider(latency=1.0), deadline=0.05, hedge_after=0)
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(provider.check(**ACTIVITY))
+        self.assertEqual(provider.stats()["timeouts"], 1)
+
+    def test_open_circuit_fails_fast(self):
+        failing = FakeWeatherProvider(error_rate=1.0)
+        provider = ResilientProvider(failing, breaker=CircuitBreaker(failure_threshold=2))
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                asyncio.run(provider.check(**ACTIVITY))
+        with self.assertRaises(CircuitOpenError):
+            asyncio.run(provider.check(**ACTIVITY))
+        self.assertEqual((failing.calls, provider.stats()["circuit"]), (2, "open"))
+
+    def test_cancelled_trial_lets_the_next_one_through(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+        breaker._opened_at -= 31  # Not by patching time.monotonic, the asyncio clock.
+        provider = ResilientProvider(
+            FakeWeatherProvider(latency=1.0), deadline=2.0, hedge_after=0, breaker=breaker
+        )
+
+        async def cancel_trial():
+            trial = asyncio.ensure_future(provider.check(**ACTIVITY))
+            await asyncio.sleep(0.01)
+            trial.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await trial
+
+        asyncio.run(cancel_trial())
+        self.assertEqual(breaker.state, "half_open")
+        self.assertTrue(breaker.allow())
+
+    def test_fake_providers_must_answer(self):
+        with self.assertRaises(TypeError):
+            FakeProvider()
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_single_trial_after_reset_timeout(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        later = time.monotonic() + 31
+        with mock.patch("time.monotonic", return_value=later):
+            self.assertEqual(breaker.state, "half_open")
+            self.assertTrue(breaker.allow())
+            self.assertFalse(breaker.allow())  # One trial at a time.
+            breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+        with mock.patch("time.monotonic", return_value=time.monotonic() + 31):
+            self.assertTrue(breaker.allow())
+            breaker.record_failure()
+            self.assertEqual(breaker.state, "open")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the Places API rate limiter."""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from nomad_ai.tools.rate_limit import (
+    PRIORITY_IN_TRIP,
+    PRIORITY_INSPIRATION,
+    RateLimiter,
+    RateLimitTimeout,
+)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for RateLimiter."""
+
+    def test_burst_then_refill(self):
+        limiter = RateLimiter(qps=100, burst=3, deadline=1)
+        started = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.015)
+        self.assertEqual(limiter.stats()["granted"], 5)
+
+    def test_deadline(self):
+        limiter = RateLimiter(qps=1, burst=1, deadline=0.05)
+        limiter.acquire()
+        with self.assertRaises(RateLimitTimeout):
+            limiter.acquire()
+        self.assertEqual(limiter.stats()["timed_out"], 1)
+        self.assertEqual(limiter.stats()["queue_depth"], 0)
+
+    def test_in_trip_goes_first(self):
+        limiter = RateLimiter(qps=20, burst=1, deadline=2)
+        limiter.acquire()
+        order = []
+
+        def worker(name, priority):
+            limiter.acquire(priority)
+            order.append(name)
+
+        threads = [threading.Thread(target=worker, args=(f"browse{i}", PRIORITY_INSPIRATION)) for i in range(3)]
+        for t in threads:
+            t.start()
+        while limiter.stats()["queue_depth"] < 3:
+            time.sleep(0.001)
+        urgent = threading.Thread(target=worker, args=("in_trip", PRIORITY_IN_TRIP))
+        urgent.start()
+        for t in threads + [urgent]:
+            t.join()
+        self.assertEqual(order[0], "in_trip")
+
+    def test_async_acquire(self):
+        limiter = RateLimiter(qps=200, burst=2, deadline=1)
+
+        async def main():
+            await asyncio.gather(*(limiter.acquire_async() for _ in range(6)))
+
+        asyncio.run(main())
+        stats = limiter.stats()
+        self.assertEqual(stats["granted"], 6)
+        self.assertGreater(stats["max_wait"], 0)
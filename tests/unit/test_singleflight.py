@@ -0,0 +1,76 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import unittest
+
+from nomad_ai.tools.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for SingleFlight and AsyncSingleFlight."""
+
+    def test_threads_share_one_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        runs = []
+
+        def lookup(query):
+            runs.append(query)
+            release.wait(timeout=5)
+            return {"place_id": query}
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(flight.do, "space needle", lookup, "a") for _ in range(8)]
+            while flight.stats()["calls"] < 8:
+                time.sleep(0.001)
+            release.set()
+            results = [f.result() for f in futures]
+
+        self.assertEqual(runs, ["a"])
+        self.assertTrue(all(r == {"place_id": "a"} for r in results))
+        self.assertEqual(flight.stats()["coalesced"], 7)
+        self.assertEqual(flight.stats()["in_flight"], 0)
+
+    def test_errors_clear_the_slot(self):
+        flight = SingleFlight()
+
+        def lookup():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            flight.do("key", lookup)
+        self.assertEqual(flight.stats()["in_flight"], 0)
+
+    def test_coroutines_share_one_call(self):
+        flight = AsyncSingleFlight()
+        runs = []
+
+        async def lookup(query):
+            runs.append(query)
+            await asyncio.sleep(0.01)
+            return {"place_id": query}
+
+        async def main():
+            return await asyncio.gather(*(flight.do("space needle", lookup, "a") for _ in range(5)))
+
+        results = asyncio.run(main())
+        self.assertEqual(runs, ["a"])
+        self.assertEqual(results, [{"place_id": "a"}] * 5)
+        self.assertEqual(flight.stats(), {"calls": 5, "coalesced": 4, "in_flight": 0})
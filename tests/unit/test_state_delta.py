@@ -0,0 +1,114 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the suppression of no-op state writes."""
+
+from types import SimpleNamespace
+import unittest
+
+from nomad_ai.tools.state_delta import StateBudget, StateWriteFilter, serialize
+
+
+class FakeToolContext:
+    """Writes through to the session state and the call's delta, like ADK's State."""
+
+    def __init__(self, session_state, function_call_id="call-1", session_id="session-1"):
+        self.function_call_id = function_call_id
+        self.actions = SimpleNamespace(state_delta={})
+        self._invocation_context = SimpleNamespace(
+            session=SimpleNamespace(id=session_id, state=session_state)
+        )
+        self.state = self
+
+    def __setitem__(self, key, value):
+        self.write(key, value)
+
+    def write(self, key, value):
+        self._invocation_context.session.state[key] = value
+        self.actions.state_delta[key] = value
+
+
+def run_tool(write_filter, state, writes, function_call_id="call-1"):
+    tool_context = FakeToolContext(state, function_call_id)
+    write_filter.before_tool(tool=None, args={}, tool_context=tool_context)
+    for key, value in writes.items():
+        tool_context.write(key, value)
+    write_filter.after_tool(tool=None, args={}, tool_context=tool_context, tool_response={})
+    return tool_context.actions.state_delta
+
+
+class TestStateWriteFilter(unittest.TestCase):
+    def setUp(self):
+        self.filter = StateWriteFilter()
+        self.state = {"itinerary": {"days": [{"day_number": 1}]}, "origin": "SEA"}
+
+    def _call(self, writes):
+        return run_tool(self.filter, self.state, writes)
+
+    def test_unchanged_values_are_dropped(self):
+        delta = self._call(
+            {"itinerary": {"days": [{"day_number": 1}]}, "origin": "SEA", "destination": "LAX"}
+        )
+        self.assertEqual(delta, {"destination": "LAX"})
+        stats = self.filter.stats()
+        self.assertEqual(stats["suppressed"], 2)
+        self.assertEqual(
+            stats["bytes_saved"],
+            len(serialize({"days": [{"day_number": 1}]})) + len(serialize("SEA")),
+        )
+
+    def test_changed_values_are_kept(self):
+        delta = self._call({"itinerary": {"days": [{"day_number": 2}]}})
+        self.assertEqual(delta, {"itinerary": {"days": [{"day_number": 2}]}})
+        self.assertEqual(self.filter.stats()["suppressed"], 0)
+
+    def test_same_object_written_back_is_kept(self):
+        itinerary = self.state["itinerary"]
+        itinerary["days"].append({"day_number": 2})
+        delta = self._call({"itinerary": itinerary})
+        self.assertIn("itinerary", delta)
+
+
+class TestStateBudget(unittest.TestCase):
+    def setUp(self):
+        self.budget = StateBudget(budget=80, pinned_keys=["itinerary"])
+        self.filter = StateWriteFilter(budget=self.budget)
+        self.state = {"_time": "2025-06-15 08:00:00", "itinerary": {"days": []}}
+
+    def test_evicts_least_recently_written_unpinned_keys(self):
+        run_tool(self.filter, self.state, {"note_a": "a" * 20}, "call-1")
+        run_tool(self.filter, self.state, {"note_b": "b" * 20}, "call-2")
+        delta = run_tool(self.filter, self.state, {"note_c": "c" * 20}, "call-3")
+
+        self.assertEqual(delta, {"note_c": "c" * 20, "note_a": None})
+        self.assertIsNone(self.state["note_a"])
+        self.assertEqual(self.state["itinerary"], {"days": []})
+        self.assertEqual(self.state["_time"], "2025-06-15 08:00:00")
+
+        report = self.budget.report("session-1")
+        self.assertEqual(report["evicted"], ["note_a"])
+        self.assertLessEqual(report["total_bytes"], 80)
+
+    def test_report_tracks_growth(self):
+        run_tool(self.filter, self.state, {"itinerary": {"days": [1]}}, "call-1")
+        run_tool(self.filter, self.state, {"itinerary": {"days": [1, 2, 3]}}, "call-2")
+        keys = {entry["key"]: entry for entry in self.budget.report("session-1")["largest_keys"]}
+        self.assertEqual(keys["itinerary"]["writes"], 2)
+        self.assertEqual(keys["itinerary"]["growth"], 4)
+        self.assertTrue(keys["itinerary"]["pinned"])
+        self.assertTrue(keys["_time"]["pinned"])
+
+
+if __name__ == "__main__":
+    unittest.main()
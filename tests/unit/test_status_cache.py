@@ -0,0 +1,101 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the cache of check statuses."""
+
+import asyncio
+from datetime import datetime
+import unittest
+from unittest import mock
+
+from nomad_ai.sub_agents.in_trip import tools
+from nomad_ai.sub_agents.in_trip.monitor import BOOKING, FLIGHT, WEATHER
+from nomad_ai.sub_agents.in_trip.status_cache import StatusCache
+
+FLIGHT_ARGS = {
+    "flight_number": "AA1234",
+    "flight_date": "2025-06-15",
+    "checkin_time": "07:30",
+    "departure_time": "08:00",
+}
+TTLS = {FLIGHT: 6 * 3600, BOOKING: 12 * 3600, WEATHER: 3 * 3600}
+
+
+class TestStatusCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = StatusCache(ttls=TTLS, ttl_fraction=0.1, min_ttl=60)
+
+    def test_ttl_shrinks_as_departure_approaches(self):
+        far = self.cache.ttl(FLIGHT, FLIGHT_ARGS, datetime(2025, 6, 1))
+        day_before = self.cache.ttl(FLIGHT, FLIGHT_ARGS, datetime(2025, 6, 14, 8, 0))
+        hour_before = self.cache.ttl(FLIGHT, FLIGHT_ARGS, datetime(2025, 6, 15, 7, 0))
+        departed = self.cache.ttl(FLIGHT, FLIGHT_ARGS, datetime(2025, 6, 15, 9, 0))
+        self.assertEqual(far, 6 * 3600)
+        self.assertAlmostEqual(day_before, 0.1 * 24 * 3600)
+        self.assertEqual((hour_before, departed), (360, 60))
+
+    def test_keyed_by_flight_and_date(self):
+        self.cache.put(FLIGHT, FLIGHT_ARGS, {"status": "On time"}, datetime(2025, 6, 1))
+        same_flight = {**FLIGHT_ARGS, "flight_number": " aa1234", "checkin_time": "07:00"}
+        self.assertEqual(self.cache.get(FLIGHT, same_flight), {"status": "On time"})
+        self.assertIsNone(self.cache.get(FLIGHT, {**FLIGHT_ARGS, "flight_date": "2025-06-16"}))
+        self.assertEqual(self.cache.stats()[FLIGHT]["hit_rate"], 0.5)
+
+    def test_expiry(self):
+        self.cache.put(FLIGHT, FLIGHT_ARGS, {"status": "On time"}, datetime(2025, 6, 1))
+        with mock.patch("time.monotonic", return_value=float("inf")):
+            self.assertIsNone(self.cache.get(FLIGHT, FLIGHT_ARGS))
+
+    def test_invalidate(self):
+        booking = {"event_name": "Space Needle", "event_date": "2025-06-16", "event_location": ""}
+        self.cache.put(FLIGHT, FLIGHT_ARGS, {"status": "On time"})
+        self.cache.put(BOOKING, booking, {"status": "Open"})
+        self.assertEqual(self.cache.invalidate(BOOKING, booking), 1)
+        self.assertIsNone(self.cache.get(BOOKING, booking))
+        self.assertIsNotNone(self.cache.get(FLIGHT, FLIGHT_ARGS))
+        self.assertEqual(self.cache.invalidate(), 1)
+
+
+class TestCachedChecks(unittest.TestCase):
+    def setUp(self):
+        self.cache = StatusCache(ttls=TTLS)
+        patcher = mock.patch.object(tools, "status_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_repeated_batches_are_answered_from_cache(self):
+        calls = []
+
+        def check(**args):
+            calls.append(args)
+            return {"status": "checked"}
+
+        now = datetime(2025, 6, 1)
+        first = asyncio.run(tools.run_checks(check, [FLIGHT_ARGS], kind=FLIGHT, now=now))
+        second = asyncio.run(tools.run_checks(check, [FLIGHT_ARGS], kind=FLIGHT, now=now))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((first["cached"], second["cached"]), (0, 1))
+        self.assertEqual(second["results"], first["results"])
+
+    def test_failures_are_not_cached(self):
+        def check(**args):
+            raise RuntimeError("provider down")
+
+        for _ in range(2):
+            batch = asyncio.run(tools.run_checks(check, [FLIGHT_ARGS], kind=FLIGHT))
+            self.assertEqual(batch["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
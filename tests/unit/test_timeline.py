@@ -0,0 +1,88 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the itinerary timeline index."""
+
+import copy
+from datetime import datetime
+import json
+import unittest
+from unittest import mock
+
+from nomad_ai.sub_agents.in_trip import timeline
+from nomad_ai.sub_agents.in_trip.timeline import Timeline, get_timeline
+
+with open("nomad_ai/profiles/itinerary_seattle_example.json", "r") as file:
+    SCENARIO = json.load(file)["state"]
+ITINERARY = SCENARIO["itinerary"]
+HOME = SCENARIO["user_profile"]["home"]
+
+
+class TestTimeline(unittest.TestCase):
+    def setUp(self):
+        self.timeline = Timeline(ITINERARY)
+        self.events = [event for day in ITINERARY["days"] for event in day["events"]]
+
+    def test_next_event_from_home(self):
+        origin, destin = self.timeline.segment(HOME, datetime(2025, 6, 15, 4, 0))
+        self.assertIs(origin, HOME)
+        self.assertIs(destin, self.events[0])
+
+    def test_next_event_on_a_later_day(self):
+        # 09:00 the next day is due, even though 09:00 is earlier than 14:00.
+        origin, destin = self.timeline.segment(HOME, datetime(2025, 6, 15, 14, 0))
+        self.assertEqual((origin, destin), (self.events[0], self.events[1]))
+
+    def test_event_due_now_is_next(self):
+        origin, destin = self.timeline.segment(HOME, datetime(2025, 6, 16, 12, 30))
+        self.assertEqual((origin, destin), (self.events[1], self.events[2]))
+
+    def test_after_the_last_event(self):
+        origin, destin = self.timeline.segment(HOME, datetime(2025, 7, 1, 0, 0))
+        self.assertEqual((origin, destin), (self.events[-2], self.events[-1]))
+
+    def test_empty_itinerary(self):
+        self.assertEqual(Timeline({"days": []}).segment(HOME, datetime(2025, 6, 15)), (HOME, HOME))
+
+    def test_untimed_events_stay_due_all_day(self):
+        itinerary = {
+            "days": [
+                {"date": "2025-06-15", "events": [{"event_type": "dinner"}]},
+                {"date": "2025-06-16", "events": [{"event_type": "visit", "start_time": "09:00"}]},
+            ]
+        }
+        _, destin = Timeline(itinerary).segment(HOME, datetime(2025, 6, 15, 23, 0))
+        self.assertEqual(destin["event_type"], "dinner")
+
+    def test_cached_by_content(self):
+        self.assertIs(get_timeline(ITINERARY), get_timeline(copy.deepcopy(ITINERARY)))
+        changed = copy.deepcopy(ITINERARY)
+        changed["days"][0]["events"][0]["boarding_time"] = "06:30"
+        self.assertIsNot(get_timeline(ITINERARY), get_timeline(changed))
+
+    def test_fingerprint_reused_for_the_same_object(self):
+        itinerary = copy.deepcopy(ITINERARY)
+        with mock.patch.object(timeline, "fingerprint", wraps=timeline.fingerprint) as fingerprint:
+            before = get_timeline(itinerary)
+            self.assertIs(get_timeline(itinerary), before)
+            self.assertEqual(fingerprint.call_count, 1)
+
+            itinerary["days"][0]["events"][0]["boarding_time"] = "06:30"
+            timeline.forget_fingerprints()
+            self.assertIsNot(get_timeline(itinerary), before)
+            self.assertEqual(fingerprint.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
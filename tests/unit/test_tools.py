@@ -14,16 +14,20 @@
 
 """Basic tests for individual tools."""
 
+import asyncio
 import unittest
+from unittest import mock
 
 from dotenv import load_dotenv
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.artifacts import InMemoryArtifactService
+from google.adk.events import Event
 from google.adk.sessions import InMemorySessionService
 from google.adk.tools import ToolContext
 import pytest
 from nomad_ai.agent import root_agent
 from nomad_ai.tools.memory import memorize
+from nomad_ai.tools import places
 from nomad_ai.tools.places import map_tool
 
 
@@ -72,10 +76,39 @@ class TestAgents(unittest.TestCase):
         self.tool_context.state["poi"] = {
             "places": [{"place_name": "Machu Picchu", "address": "Machu Picchu, Peru"}]
         }
-        result = map_tool(key="poi", tool_context=self.tool_context)
+        result = asyncio.run(map_tool(key="poi", tool_context=self.tool_context))
         print(result)
         self.assertIn("place_id", result["places"][0])
         self.assertEqual(
             self.tool_context.state["poi"]["places"][0]["place_id"],
             "ChIJVVVViV-abZERJxqgpA43EDo",
         )
+
+    def test_places_from_output_key_are_saved(self):
+        # The POIs as poi_agent's output_key writes them: a plain dict in the session.
+        session = session_service.create_session_sync(
+            app_name="Travel_Concierge",
+            user_id=self.user_id,
+            state={"poi": {"places": [{"place_name": "Machu Picchu", "address": "Machu Picchu, Peru"}]}},
+        )
+        invoc_context = InvocationContext(
+            session_service=session_service,
+            invocation_id="EFGH",
+            agent=root_agent,
+            session=session,
+        )
+        tool_context = ToolContext(invocation_context=invoc_context)
+        answer = {"place_id": "ChIJVVVViV-abZERJxqgpA43EDo", "map_url": "", "lat": "-13.16", "lng": "-72.54"}
+        with mock.patch.object(
+            places.async_places_service, "find_places_from_text", mock.AsyncMock(return_value=[answer])
+        ):
+            asyncio.run(map_tool(key="poi", tool_context=tool_context))
+        self.assertIn("poi", tool_context.actions.state_delta)
+
+        event = Event(invocation_id="EFGH", author="poi_agent", actions=tool_context.actions)
+        asyncio.run(session_service.append_event(session, event))
+        stored = session_service.get_session_sync(
+            app_name="Travel_Concierge", user_id=self.user_id, session_id=session.id
+        )
+        self.assertEqual(stored.state["poi"]["places"][0]["place_id"], answer["place_id"])
+
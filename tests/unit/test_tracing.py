@@ -0,0 +1,112 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the trace events."""
+
+import atexit
+import json
+import logging
+import queue
+import unittest
+from unittest import mock
+
+from nomad_ai.shared_libraries.tracing import (
+    DroppingQueueHandler,
+    TraceEvent,
+    Tracer,
+    sample_rate,
+)
+
+
+class Costly:
+    """A field value that counts how often it is formatted."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "costly"
+
+
+class TestTracer(unittest.TestCase):
+    def setUp(self):
+        self.records = queue.Queue()
+        self.handler = DroppingQueueHandler(self.records)
+        self.logger = logging.getLogger("tracing_test")
+        self.logger.addHandler(self.handler)
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_disabled_events_are_not_formatted(self):
+        costly = Costly()
+        Tracer("tracing_test").debug("hot_path", value=costly)
+        self.assertTrue(self.records.empty())
+        self.assertEqual(costly.formatted, 0)
+
+    def test_events_are_queued_unformatted(self):
+        Tracer("tracing_test").info("check", flight_number="AA1234", value=Costly())
+        record = self.records.get_nowait()
+        self.assertIsInstance(record.msg, TraceEvent)
+        self.assertEqual(
+            json.loads(record.getMessage()),
+            {"event": "check", "flight_number": "AA1234", "value": "costly"},
+        )
+
+    def test_sampling(self):
+        tracer = Tracer("tracing_test", rate=0.5)
+        with mock.patch("random.random", side_effect=[0.2, 0.7]):
+            tracer.info("kept")
+            tracer.info("sampled_out")
+        tracer.warning("never_sampled")
+        self.assertEqual(self.records.qsize(), 2)
+        self.assertEqual(tracer.sampled_out, 1)
+
+    def test_full_queue_drops(self):
+        handler = DroppingQueueHandler(queue.Queue(1))
+        self.logger.addHandler(handler)
+        try:
+            tracer = Tracer("tracing_test")
+            tracer.info("first")
+            tracer.info("second")
+        finally:
+            self.logger.removeHandler(handler)
+        self.assertEqual(handler.dropped, 1)
+
+    def test_sink_thread_starts_with_the_first_event(self):
+        sink = logging.Handler()
+        sink.emit = mock.Mock()
+        handler = DroppingQueueHandler(queue.Queue(), sink)
+        self.assertIsNone(handler._listener)
+        self.logger.addHandler(handler)
+        try:
+            Tracer("tracing_test").info("first")
+        finally:
+            self.logger.removeHandler(handler)
+            atexit.unregister(handler._listener.stop)
+            handler._listener.stop()
+        self.assertEqual(sink.emit.call_count, 1)
+
+    def test_sample_rate_of_children(self):
+        rates = {"nomad_ai.sub_agents": 0.1, "nomad_ai.sub_agents.in_trip.tools": 0.5}
+        self.assertEqual(sample_rate("nomad_ai.sub_agents.in_trip.tools", rates), 0.5)
+        self.assertEqual(sample_rate("nomad_ai.sub_agents.in_trip.timeline", rates), 0.1)
+        self.assertEqual(sample_rate("nomad_ai.tools.memory", rates), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the batched trip monitor checks."""
+
+import asyncio
+import time
+import unittest
+
+from nomad_ai.sub_agents.in_trip.tools import event_booking_check, run_checks
+
+
+def slow_check(name: str, delay: float):
+    time.sleep(delay)
+    return {"status": f"{name} checked"}
+
+
+class TestRunChecks(unittest.TestCase):
+    def test_checks_run_concurrently(self):
+        items = [{"name": f"item {i}", "delay": 0.2} for i in range(5)]
+        start = time.monotonic()
+        batch = asyncio.run(run_checks(slow_check, items, timeout=1.0, concurrency=5))
+        self.assertLess(time.monotonic() - start, 0.6)
+        self.assertEqual(
+            [result["status"] for result in batch["results"]],
+            [f"item {i} checked" for i in range(5)],
+        )
+
+    def test_timeouts_and_failures_stay_on_their_item(self):
+        items = [
+            {"name": "fast", "delay": 0.0},
+            {"name": "slow", "delay": 0.5},
+            {"name": "malformed"},
+        ]
+        batch = asyncio.run(run_checks(slow_check, items, timeout=0.1))
+        fast, slow, malformed = batch["results"]
+        self.assertEqual(fast["status"], "fast checked")
+        self.assertIn("No answer", slow["error"])
+        self.assertIn("TypeError", malformed["error"])
+        self.assertEqual((batch["timed_out"], batch["failed"]), (1, 1))
+
+    def test_event_booking_checks(self):
+        events = [
+            {"event_name": "Space Needle", "event_date": "2025-06-16", "event_location": "Seattle"},
+            {"event_name": "Pike Place", "event_date": "2025-06-16", "event_location": "Seattle"},
+        ]
+        batch = asyncio.run(run_checks(event_booking_check, events))
+        self.assertEqual(
+            [result["status"] for result in batch["results"]],
+            ["Space Needle is closed.", "Pike Place checked"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()